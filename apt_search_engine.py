@@ -1,10 +1,27 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
 import re
 import sys
 import json
 import os
+import time
+import argparse
+import hashlib
+import tempfile
+import math
+import inspect
+import socket
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from itertools import chain
+from urllib3.util import connection as urllib3_connection, make_headers
 import urllib.parse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import quote, urljoin
 
 RED = '\033[91m'
@@ -17,6 +34,130 @@ WHITE = '\033[97m'
 ENDC = '\033[0m'
 BOLD = '\033[1m'
 
+class SourcePlugin:
+    def __init__(self, name, label, hosts, collect, capabilities=(), single=False, indexes=None):
+        self.name = name
+        self.label = label
+        self.hosts = hosts
+        self.collect = collect
+        self.capabilities = capabilities
+        self.single = single
+        self.indexes = indexes or {}
+
+SOURCE_PLUGINS = {}
+
+def register_source(name, label, hosts, collect, **kwargs):
+    SOURCE_PLUGINS[name] = SourcePlugin(name, label, hosts, collect, **kwargs)
+    return SOURCE_PLUGINS[name]
+
+def select_sources(spec):
+    selected = set()
+    for token in spec.split(','):
+        token = token.strip().lower()
+        if not token:
+            continue
+        if token in SOURCE_PLUGINS:
+            selected.add(token)
+            continue
+        matching = [name for name, plugin in SOURCE_PLUGINS.items() if token in plugin.capabilities]
+        if not matching:
+            raise ValueError(f"unknown source or capability '{token}'")
+        selected.update(matching)
+    return [name for name in SOURCE_PLUGINS if name in selected]
+
+register_source('etda', 'ETDA Database', ('apt.etda.or.th',), 'collect_etda', capabilities=('html', 'profile', 'aliases', 'operations', 'mirror'), single=True)
+register_source('mitre', 'MITRE ATT&CK', ('attack.mitre.org', 'raw.githubusercontent.com/mitre-attack'), 'collect_mitre', capabilities=('json', 'profile', 'aliases', 'techniques', 'index'), indexes={'mitre_index': 'load_mitre_index'})
+register_source('google_cloud', 'Google Cloud APT', ('cloud.google.com',), 'search_google_cloud_apt', capabilities=('html', 'profile', 'index'), indexes={'google_cloud_index': 'load_google_cloud_index'})
+register_source('netenrich', 'NetEnrich', ('know.netenrich.com',), 'search_netenrich', capabilities=('html', 'links'))
+register_source('socradar', 'SOCRadar', ('socradar.io',), 'search_socradar', capabilities=('html', 'articles'))
+register_source('pulsedive', 'Pulsedive', ('pulsedive.com',), 'search_pulsedive', capabilities=('html', 'links'), single=True)
+register_source('qianxin', 'QiAnXin', ('ti.qianxin.com',), 'search_qianxin', capabilities=('html', 'links'), indexes={'qianxin_page': 'load_qianxin_page'})
+register_source('malpedia', 'Malpedia Database', ('malpedia.caad.fkie.fraunhofer.de',), 'collect_malpedia', capabilities=('json', 'html', 'profile', 'aliases', 'malware', 'index'), indexes={'malpedia_catalogue': 'load_malpedia_catalogue'})
+register_source('aptnotes', 'APTnotes Reports', ('raw.githubusercontent.com/aptnotes',), 'collect_aptnotes', capabilities=('json', 'reports', 'index'), indexes={'aptnotes_index': 'load_aptnotes_index'})
+
+SOURCE_ORDER = list(SOURCE_PLUGINS)
+SOURCE_HOSTS = {name: plugin.hosts[0] for name, plugin in SOURCE_PLUGINS.items()}
+SOURCE_LABELS = {name: plugin.label for name, plugin in SOURCE_PLUGINS.items()}
+
+RESULT_SCHEMA_VERSION = 1
+INCOMPLETE_STATUSES = frozenset(('timed_out', 'pruned', 'busy'))
+TRACE_MAX_EVENTS = 50000
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'apt_search_engine')
+DEFAULT_CACHE_TTL = 3600
+SHARED_FAILURE_TTL = 60
+CACHE_TTLS = {
+    'etda': 6 * 3600,
+    'mitre': 24 * 3600,
+    'google_cloud': 24 * 3600,
+    'netenrich': 3600,
+    'socradar': 3600,
+    'pulsedive': 3600,
+    'qianxin': 12 * 3600,
+    'malpedia': 12 * 3600,
+    'aptnotes': 24 * 3600,
+}
+
+def html_parser_name():
+    try:
+        import lxml
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+DEFAULT_POLICY = {
+    'connect_timeout': 5,
+    'read_timeout': 20,
+    'retries': 2,
+    'backoff_factor': 0.5,
+    'backoff_max': 8,
+    'failure_threshold': 3,
+    'cooldown': 300,
+    'pool_maxsize': None,
+}
+SOURCE_POLICIES = {
+    'pulsedive': {'read_timeout': 10},
+    'qianxin': {'read_timeout': 10, 'retries': 1},
+    'mitre': {'read_timeout': 60},
+    'aptnotes': {'read_timeout': 60},
+}
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_SUPPORTS_BACKOFF_MAX = 'backoff_max' in inspect.signature(Retry).parameters
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding'].replace(',', ', ')
+LINK_CACHE_TTL = 24 * 3600
+MALPEDIA_DETAIL_MAX_AGE = 7 * 24 * 3600
+ETDA_STORE_NAME = 'etda.sqlite3'
+ETDA_MIN_LISTING_RATIO = 0.5
+FUZZY_MATCH_THRESHOLD = 0.5
+FUZZY_RESOLVE_THRESHOLD = 0.8
+FUZZY_RESOLVE_MARGIN = 0.1
+SOURCE_STATS_NAME = 'source_stats.json'
+SCHEDULER_ALPHA = 0.2
+SCHEDULER_MIN_SAMPLES = 5
+SCHEDULER_MIN_HIT_RATE = 0.05
+SCHEDULER_EXPLORE_EVERY = 10
+SCHEDULER_SAVE_INTERVAL = 5
+GOOGLE_CLOUD_INDEX_NAME = 'google_cloud_index.json'
+GOOGLE_CLOUD_FIELDS = ('name', 'description', 'attribution', 'targets', 'malware')
+GOOGLE_CLOUD_LABELS = {
+    'suspected attribution': 'attribution',
+    'attribution': 'attribution',
+    'target sectors': 'targets',
+    'targets': 'targets',
+    'associated malware': 'malware',
+    'malware': 'malware',
+    'overview': 'description'
+}
+GOOGLE_CLOUD_LABEL_PATTERN = re.compile(rf"^({'|'.join(GOOGLE_CLOUD_LABELS)})\s*:\s*", re.IGNORECASE)
+
+print_lock = threading.Lock()
+trace_context = threading.local()
+
+def safe_print(*args, **kwargs):
+    with print_lock:
+        print(*args, **kwargs)
+        sys.stdout.flush()
+
 def display_banner():
     print(f"{BEBEBLUE}" + "="*80 + f"{ENDC}")
     print(f"{VIOLET}{BOLD} █████╗ ██████╗ ████████╗      ███████╗███╗   ██╗ ██████╗ ██╗███╗   ██╗███████╗{ENDC}")
@@ -32,8 +173,1112 @@ def display_banner():
     print(f"{GREEN}{BOLD}Created by Muhap Yahia{ENDC}")
     print(f"{BEBEBLUE}" + "="*80 + f"{ENDC}")
 
+def current_source():
+    return getattr(trace_context, 'source', None)
+
+def traced_create_connection(address, *args, **kwargs):
+    host, port = address
+    start = time.perf_counter()
+    try:
+        addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)))
+    except OSError:
+        addresses = [host]
+    resolved = time.perf_counter()
+    
+    last_error = None
+    sock = None
+    for ip_address in addresses:
+        try:
+            sock = original_create_connection((ip_address, port), *args, **kwargs)
+            break
+        except OSError as error:
+            last_error = error
+    connected = time.perf_counter()
+    
+    trace_context.dns = getattr(trace_context, 'dns', 0) + resolved - start
+    trace_context.connect = getattr(trace_context, 'connect', 0) + connected - resolved
+    trace_context.new_connections = getattr(trace_context, 'new_connections', 0) + 1
+    
+    if sock is None:
+        raise last_error or OSError(f"could not connect to {host}:{port}")
+    return sock
+
+original_create_connection = urllib3_connection.create_connection
+
+class SearchTracer:
+    def __init__(self, max_events=TRACE_MAX_EVENTS):
+        self.events = deque(maxlen=max_events)
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+
+    @staticmethod
+    def install():
+        if urllib3_connection.create_connection is not traced_create_connection:
+            urllib3_connection.create_connection = traced_create_connection
+
+    def record(self, event_type, **fields):
+        event = {'type': event_type, 'time': round(time.time() - self.started_at, 6)}
+        event['source'] = fields.pop('source', None) or current_source()
+        event.update(fields)
+        with self.lock:
+            if len(self.events) == self.events.maxlen:
+                self.dropped += 1
+            self.events.append(event)
+
+    def write_json(self, path):
+        with self.lock:
+            events = list(self.events)
+            dropped = self.dropped
+        document = {
+            'started_at': self.started_at,
+            'dropped_events': dropped,
+            'events': events,
+            'summary': self.summarize(events),
+            'transfer': self.transfer_totals()
+        }
+        write_file_atomic(path, json.dumps(document, indent=2, default=str).encode('utf-8'))
+
+    def summarize(self, events=None):
+        if events is None:
+            with self.lock:
+                events = list(self.events)
+        
+        summary = {}
+        for event in events:
+            source = event.get('source') or 'other'
+            row = summary.setdefault(source, {
+                'requests': 0, 'cached': 0, 'errors': 0, 'bytes': 0, 'wire_bytes': 0, 'new_connections': 0,
+                'dns_ms': 0.0, 'connect_ms': 0.0, 'wait_ms': 0.0, 'transfer_ms': 0.0,
+                'parse_ms': 0.0, 'wall_ms': 0.0
+            })
+            if event['type'] == 'request':
+                row['requests'] += 1
+                row['cached'] += 1 if event.get('from_cache') else 0
+                row['bytes'] += event.get('bytes', 0)
+                row['new_connections'] += event.get('new_connections', 0)
+                if not event.get('from_cache'):
+                    row['wire_bytes'] += event.get('wire_bytes', 0)
+                for field in ('dns_ms', 'connect_ms', 'wait_ms', 'transfer_ms'):
+                    row[field] += event.get(field, 0)
+                if event.get('error'):
+                    row['errors'] += 1
+            elif event['type'] == 'parse':
+                row['parse_ms'] += event.get('parse_ms', 0)
+            elif event['type'] == 'error':
+                row['errors'] += 1
+            elif event['type'] == 'source':
+                row['wall_ms'] += event.get('wall_ms', 0)
+        
+        return summary
+
+    def format_summary(self):
+        summary = self.summarize()
+        if not summary:
+            return ""
+        
+        output = []
+        output.append(f"\n{VIOLET}{BOLD}{'='*110}{ENDC}")
+        output.append(f"{VIOLET}{BOLD}SOURCE TIMING SUMMARY{ENDC}")
+        output.append(f"{VIOLET}{BOLD}{'='*110}{ENDC}")
+        output.append(f"{CYAN}{'Source':<14}{'Wall ms':>10}{'Reqs':>6}{'Cached':>8}{'Errors':>8}{'KiB':>10}{'Wire KiB':>10}{'Conns':>7}{'DNS ms':>9}{'Conn ms':>9}{'Wait ms':>10}{'Xfer ms':>10}{'Parse ms':>10}{ENDC}")
+        
+        for source, row in sorted(summary.items(), key=lambda item: -item[1]['wall_ms']):
+            color = RED if row['errors'] else WHITE
+            output.append(f"{color}{source:<14}{row['wall_ms']:>10.0f}{row['requests']:>6}{row['cached']:>8}{row['errors']:>8}{row['bytes'] / 1024:>10.1f}{row['wire_bytes'] / 1024:>10.1f}{row['new_connections']:>7}{row['dns_ms']:>9.0f}{row['connect_ms']:>9.0f}{row['wait_ms']:>10.0f}{row['transfer_ms']:>10.0f}{row['parse_ms']:>10.0f}{ENDC}")
+        
+        transfer = self.transfer_totals()
+        output.append(f"\n{YELLOW}Network: {transfer['wire_bytes'] / 1024:.1f} KiB on the wire for {transfer['bytes'] / 1024:.1f} KiB of content ({transfer['bytes_saved'] / 1024:.1f} KiB saved by compression); {transfer['new_connections']} connections opened, {transfer['reused_connections']} requests on reused connections{ENDC}")
+        return "\n".join(output)
+
+    def transfer_totals(self):
+        with self.lock:
+            events = [event for event in self.events if event['type'] == 'request' and not event.get('from_cache') and not event.get('error')]
+        
+        content_bytes = sum(event.get('bytes', 0) for event in events if event.get('wire_bytes'))
+        wire_bytes = sum(event.get('wire_bytes', 0) for event in events)
+        new_connections = sum(event.get('new_connections', 0) for event in events)
+        return {
+            'bytes': content_bytes,
+            'wire_bytes': wire_bytes,
+            'bytes_saved': max(0, content_bytes - wire_bytes),
+            'new_connections': new_connections,
+            'reused_connections': sum(1 for event in events if not event.get('new_connections'))
+        }
+
+class SourceUnavailableError(requests.ConnectionError):
+    pass
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, cooldown):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at < self.cooldown or self.trial_running:
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+
+    @property
+    def is_open(self):
+        with self.lock:
+            return self.opened_at is not None
+
+def write_file_atomic(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class ResponseCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + '.json', base + '.body'
+
+    def get(self, url):
+        meta_path, body_path = self.paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            return meta, body
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url, meta, body=None):
+        meta_path, body_path = self.paths(url)
+        try:
+            if body is not None:
+                write_file_atomic(body_path, body)
+            write_file_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError:
+            pass
+
+class CachingAdapter(HTTPAdapter):
+    skipped_headers = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+    def __init__(self, cache=None, ttl=DEFAULT_CACHE_TTL, tracer=None, policy=None, **kwargs):
+        self.policy = dict(DEFAULT_POLICY)
+        if policy:
+            self.policy.update(policy)
+        
+        retry_options = {
+            'total': self.policy['retries'],
+            'status_forcelist': RETRY_STATUSES,
+            'allowed_methods': ['GET', 'HEAD'],
+            'backoff_factor': self.policy['backoff_factor'],
+            'respect_retry_after_header': True,
+            'raise_on_status': False
+        }
+        if RETRY_SUPPORTS_BACKOFF_MAX:
+            retry_options['backoff_max'] = self.policy['backoff_max']
+        kwargs.setdefault('max_retries', Retry(**retry_options))
+        if self.policy['pool_maxsize']:
+            kwargs['pool_maxsize'] = self.policy['pool_maxsize']
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.ttl = ttl
+        self.tracer = tracer
+        self.breaker = CircuitBreaker(self.policy['failure_threshold'], self.policy['cooldown'])
+
+    def send(self, request, stream=False, **kwargs):
+        if self.tracer is None:
+            return self.send_cached(request, stream=stream, **kwargs)
+        
+        trace_context.dns = trace_context.connect = 0
+        trace_context.new_connections = 0
+        start = time.perf_counter()
+        event = {'method': request.method, 'url': request.url}
+        try:
+            response = self.send_cached(request, stream=stream, **kwargs)
+            headers_received = time.perf_counter()
+            if not stream:
+                response.content
+            finished = time.perf_counter()
+            
+            from_cache = getattr(response, 'from_cache', False)
+            event.update({
+                'status': response.status_code,
+                'bytes': len(response.content) if not stream else 0,
+                'wire_bytes': response.raw.tell() if response.raw is not None and not from_cache and not stream else 0,
+                'content_encoding': response.headers.get('Content-Encoding'),
+                'from_cache': from_cache,
+                'wait_ms': (headers_received - start - trace_context.dns - trace_context.connect) * 1000,
+                'transfer_ms': (finished - headers_received) * 1000
+            })
+            return response
+        except Exception as error:
+            event['error'] = repr(error)
+            raise
+        finally:
+            event['dns_ms'] = trace_context.dns * 1000
+            event['connect_ms'] = trace_context.connect * 1000
+            event['new_connections'] = trace_context.new_connections
+            event['total_ms'] = (time.perf_counter() - start) * 1000
+            self.tracer.record('request', **event)
+
+    def send_network(self, request, **kwargs):
+        if not self.breaker.allow():
+            raise SourceUnavailableError(f"{urllib.parse.urlsplit(request.url).netloc} is cooling down after repeated failures", request=request)
+        
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = (self.policy['connect_timeout'], self.policy['read_timeout'])
+        
+        try:
+            response = super().send(request, **kwargs)
+        except requests.RequestException:
+            self.breaker.record_failure()
+            if self.tracer and self.breaker.is_open:
+                self.tracer.record('circuit_open', url=request.url)
+            raise
+        
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def send_cached(self, request, stream=False, **kwargs):
+        conditional = 'If-None-Match' in request.headers or 'If-Modified-Since' in request.headers
+        if self.cache is None or request.method != 'GET' or stream or conditional:
+            return self.send_network(request, stream=stream, **kwargs)
+        
+        cached = self.cache.get(request.url)
+        if cached:
+            meta, body = cached
+            if time.time() - meta.get('stored_at', 0) < self.ttl:
+                return self.build_cached_response(request, meta, body)
+            
+            if meta.get('etag'):
+                request.headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request.headers['If-Modified-Since'] = meta['last_modified']
+        
+        try:
+            response = self.send_network(request, stream=stream, **kwargs)
+        except requests.RequestException:
+            if cached:
+                return self.build_cached_response(request, meta, body)
+            raise
+        
+        if cached and response.status_code in RETRY_STATUSES:
+            response.close()
+            return self.build_cached_response(request, meta, body)
+        
+        if cached and response.status_code == 304:
+            response.close()
+            meta['stored_at'] = time.time()
+            self.cache.put(request.url, meta)
+            return self.build_cached_response(request, meta, body)
+        
+        if response.status_code == 200:
+            headers = {name: value for name, value in response.headers.items() if name.lower() not in self.skipped_headers}
+            self.cache.put(request.url, {
+                'url': request.url,
+                'status': response.status_code,
+                'headers': headers,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'stored_at': time.time()
+            }, response.content)
+        
+        return response
+
+    def build_cached_response(self, request, meta, body):
+        response = requests.Response()
+        response.status_code = meta.get('status', 200)
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+        return response
+
+def clean_stix_text(text):
+    if not text:
+        return ''
+    text = re.sub(r'\s*\(Citation:[^)]*\)', '', text)
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'<[^>]+>', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def stix_attack_id(stix_object):
+    for reference in stix_object.get('external_references', []):
+        if reference.get('source_name') == 'mitre-attack' and reference.get('external_id'):
+            return reference['external_id']
+    return None
+
+class MitreAttackIndex:
+    def __init__(self, groups):
+        self.groups = groups
+        self.aliases = {}
+        self.search_entries = []
+        
+        for group_id, group in groups.items():
+            self.aliases[group_id.lower()] = group_id
+            self.aliases[group['name'].lower()] = group_id
+            for alias in group['associated_groups'].split(', '):
+                if alias:
+                    self.aliases.setdefault(alias.lower(), group_id)
+            self.search_entries.append((f"{group['name']} {group['associated_groups']}".lower(), group_id))
+
+    @classmethod
+    def from_bundle(cls, bundle, mitre_base):
+        objects = bundle.get('objects', [])
+        active = [obj for obj in objects if not obj.get('revoked') and not obj.get('x_mitre_deprecated')]
+        
+        techniques = {}
+        technique_names = {}
+        intrusion_sets = {}
+        for obj in active:
+            attack_id = stix_attack_id(obj)
+            if not attack_id:
+                continue
+            if obj.get('type') == 'attack-pattern':
+                techniques[obj['id']] = attack_id
+                technique_names[attack_id] = obj.get('name', '')
+            elif obj.get('type') == 'intrusion-set':
+                intrusion_sets[obj['id']] = (attack_id, obj)
+        
+        uses = {}
+        for obj in active:
+            if obj.get('type') == 'relationship' and obj.get('relationship_type') == 'uses':
+                source_ref = obj.get('source_ref')
+                target_ref = obj.get('target_ref')
+                if source_ref in intrusion_sets and target_ref in techniques:
+                    uses.setdefault(source_ref, []).append((techniques[target_ref], obj.get('description', '')))
+        
+        groups = {}
+        for stix_id, (group_id, obj) in intrusion_sets.items():
+            name = obj.get('name', '')
+            aliases = [alias for alias in obj.get('aliases', []) if alias != name]
+            description = (obj.get('description') or '').split('\n\n')[0]
+            
+            group_techniques = []
+            for tech_id, tech_use in sorted(uses.get(stix_id, [])):
+                tech_name = technique_names.get(tech_id, '')
+                if '.' in tech_id:
+                    parent_name = technique_names.get(tech_id.split('.')[0])
+                    if parent_name:
+                        tech_name = f"{parent_name}: {tech_name}"
+                group_techniques.append({
+                    'domain': 'Enterprise',
+                    'id': tech_id,
+                    'name': tech_name,
+                    'use': clean_stix_text(tech_use)
+                })
+            
+            groups[group_id] = {
+                'url': f"{mitre_base}/groups/{group_id}/",
+                'techniques': group_techniques,
+                'id': group_id,
+                'name': name,
+                'associated_groups': ', '.join(aliases),
+                'description': clean_stix_text(description)
+            }
+        
+        return cls(groups)
+
+    def copy_group(self, group_id):
+        group = dict(self.groups[group_id])
+        group['techniques'] = [dict(tech) for tech in group['techniques']]
+        return group
+
+    def lookup(self, identifier):
+        group_id = self.aliases.get(identifier.strip().lower())
+        return self.copy_group(group_id) if group_id else None
+
+    def match_ids(self, apt_name):
+        query = apt_name.lower()
+        return [group_id for search_text, group_id in self.search_entries if query in search_text]
+
+    def search(self, apt_name):
+        return [self.copy_group(group_id) for group_id in self.match_ids(apt_name)]
+
+def file_stem(name):
+    return re.sub(r'[^A-Za-z0-9.-]+', '_', name).strip('_') or 'layer'
+
+def navigator_filename(name):
+    return f"{file_stem(name)}_MITRE_Navigator.json"
+
+def report_filename(name):
+    return f"{file_stem(name)}_MITRE_Techniques_Report.txt"
+
+def build_navigator_layer(name, description, groups):
+    groups = list(groups)
+    techniques = {}
+    for group in groups:
+        label = group.get('name') or group.get('id', 'Unknown')
+        for tech in group.get('techniques', []):
+            entry = techniques.setdefault(tech['id'], ({}, {}))
+            entry[0][group.get('id') or label] = True
+            if tech.get('use'):
+                entry[1][f"{label}: {tech['use']}" if len(groups) > 1 else tech['use']] = True
+    
+    max_score = max((len(users) for users, _ in techniques.values()), default=1)
+    return {
+        "name": name,
+        "description": description,
+        "domain": "enterprise-attack",
+        "version": "4.5",
+        "gradient": {"colors": ["#ffffff", "#ff6666"], "minValue": 0, "maxValue": max_score},
+        "techniques": [{
+            "techniqueID": tech_id,
+            "score": len(users),
+            "comment": "\n".join(comments)
+        } for tech_id, (users, comments) in sorted(techniques.items())]
+    }
+
+def tokenize(text):
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+def split_token(token):
+    parts = re.findall(r'[a-z]+|[0-9]+', token)
+    return parts if len(parts) > 1 else []
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+class APTnotesIndex:
+    fields = (('Title', 2), ('Filename', 1))
+
+    def __init__(self, entries, postings=None, fingerprint='', prefix=True, ngrams=False):
+        self.entries = entries
+        self.fingerprint = fingerprint
+        self.postings = postings if postings is not None else self.build_postings(entries)
+        self.vocabulary = sorted(self.postings)
+        self.prefix = prefix
+        self.ngram_postings = self.build_ngram_postings(self.vocabulary) if ngrams else None
+
+    @classmethod
+    def build_postings(cls, entries):
+        postings = {}
+        for entry_id, entry in enumerate(entries):
+            for field, weight in cls.fields:
+                for token in tokenize(entry.get(field) or ''):
+                    for term in [token] + split_token(token):
+                        term_postings = postings.setdefault(term, {})
+                        if term_postings.get(entry_id, 0) < weight:
+                            term_postings[entry_id] = weight
+        return postings
+
+    @staticmethod
+    def build_ngram_postings(vocabulary):
+        ngram_postings = {}
+        for token in vocabulary:
+            for gram in trigrams(token):
+                ngram_postings.setdefault(gram, set()).add(token)
+        return ngram_postings
+
+    def to_dict(self):
+        return {
+            'fingerprint': self.fingerprint,
+            'postings': {term: [[entry_id, weight] for entry_id, weight in term_postings.items()] for term, term_postings in self.postings.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data, entries, **kwargs):
+        postings = {term: {entry_id: weight for entry_id, weight in term_postings} for term, term_postings in data['postings'].items()}
+        return cls(entries, postings, data.get('fingerprint', ''), **kwargs)
+
+    def expand(self, term):
+        tokens = {term} if term in self.postings else set()
+        
+        if self.prefix and len(term) >= 3 and term.isalpha():
+            position = bisect_left(self.vocabulary, term)
+            while position < len(self.vocabulary) and self.vocabulary[position].startswith(term):
+                tokens.add(self.vocabulary[position])
+                position += 1
+        
+        if self.ngram_postings is not None and len(term) >= 3:
+            grams = trigrams(term)
+            candidates = set.intersection(*(self.ngram_postings.get(gram, set()) for gram in grams))
+            tokens.update(token for token in candidates if term in token)
+        
+        return tokens
+
+    def search(self, apt_name, limit=None):
+        words = tokenize(apt_name)
+        if not words:
+            return []
+        
+        compact = ''.join(words)
+        terms = []
+        for word in words:
+            for term in split_token(word) or [word]:
+                if term not in terms:
+                    terms.append(term)
+        
+        total = len(self.entries) or 1
+        scores = {}
+        coverage = {}
+        compact_hits = set()
+        term_weights = {}
+        
+        for term in terms + ([compact] if compact not in terms else []):
+            tokens = self.expand(term)
+            if not tokens:
+                continue
+            term_weights[term] = math.log(1 + total / max(len(self.postings[token]) for token in tokens))
+            
+            for token in tokens:
+                token_postings = self.postings[token]
+                idf = math.log(1 + total / len(token_postings))
+                exactness = 1.0 if token == term else 0.5
+                
+                for entry_id, weight in token_postings.items():
+                    scores[entry_id] = scores.get(entry_id, 0) + idf * weight * exactness
+                    if term == compact and len(terms) > 1:
+                        compact_hits.add(entry_id)
+                    else:
+                        coverage.setdefault(entry_id, set()).add(term)
+        
+        total_weight = sum(term_weights.get(term, math.log(1 + total)) for term in terms)
+        matches = []
+        for entry_id, score in scores.items():
+            covered = sum(term_weights[term] for term in coverage.get(entry_id, ()))
+            if entry_id in compact_hits or covered >= total_weight * 0.5:
+                matches.append((score, entry_id))
+        
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        if limit:
+            matches = matches[:limit]
+        return [self.entries[entry_id] for score, entry_id in matches]
+
+def normalize_alias(name):
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+def name_trigrams(compact):
+    return trigrams(f"  {compact} ")
+
+class NameMatcher:
+    def __init__(self, records):
+        self.keys = []
+        self.names = []
+        self.gram_counts = []
+        self.postings = {}
+        self.token_postings = {}
+        self.exact = {}
+        for key, names in records:
+            record_id = len(self.keys)
+            self.keys.append(key)
+            for name in names:
+                compact = normalize_alias(name or '')
+                if not compact:
+                    continue
+                name_id = len(self.names)
+                grams = name_trigrams(compact)
+                self.names.append((record_id, name))
+                self.gram_counts.append(len(grams))
+                self.exact.setdefault(compact, []).append(name_id)
+                for gram in grams:
+                    self.postings.setdefault(gram, []).append(name_id)
+                for token in set(tokenize(name)):
+                    self.token_postings.setdefault(token, []).append(name_id)
+
+    def score_names(self, query, threshold=FUZZY_MATCH_THRESHOLD, tokens=True):
+        compact = normalize_alias(query or '')
+        if not compact:
+            return {}
+        grams = name_trigrams(compact)
+        query_tokens = set(tokenize(query))
+        gram_counts = self.gram_counts
+        
+        overlaps = Counter(chain.from_iterable(self.postings.get(gram, ()) for gram in grams))
+        name_scores = {name_id: 2 * overlap / (len(grams) + gram_counts[name_id]) for name_id, overlap in overlaps.items()}
+        if tokens and query_tokens:
+            token_hits = Counter(chain.from_iterable(self.token_postings.get(token, ()) for token in query_tokens))
+            for name_id, hits in token_hits.items():
+                token_score = 0.8 * hits / len(query_tokens)
+                if token_score > name_scores.get(name_id, 0):
+                    name_scores[name_id] = token_score
+        for name_id in self.exact.get(compact, ()):
+            name_scores[name_id] = 1.0
+        
+        scores = {}
+        for name_id, score in name_scores.items():
+            if score >= threshold:
+                record_id, name = self.names[name_id]
+                if score > scores.get(record_id, (0, None))[0]:
+                    scores[record_id] = (score, name)
+        return scores
+
+    def top(self, query, limit=5, threshold=FUZZY_MATCH_THRESHOLD, tokens=True):
+        scores = self.score_names(query, threshold, tokens)
+        ranked = sorted(((score, record_id, name) for record_id, (score, name) in scores.items()), key=lambda item: (-item[0], item[1]))
+        if limit:
+            ranked = ranked[:limit]
+        return [(self.keys[record_id], score, name) for score, record_id, name in ranked]
+
+    def best(self, query, threshold=FUZZY_RESOLVE_THRESHOLD):
+        matches = self.top(query, 2, threshold - FUZZY_RESOLVE_MARGIN, tokens=False)
+        if not matches or matches[0][1] < threshold:
+            return None
+        if len(matches) > 1 and matches[0][1] - matches[1][1] < FUZZY_RESOLVE_MARGIN:
+            return None
+        return matches[0][0]
+
+class GoogleCloudActorIndex:
+    def __init__(self, records, fingerprint=''):
+        self.records = records
+        self.fingerprint = fingerprint
+        self.texts = [' '.join(record.values()).lower() for record in records]
+        self.names = {}
+        self.postings = {}
+        
+        for record_id, record in enumerate(records):
+            self.names.setdefault(normalize_alias(record['name']), []).append(record_id)
+            for token in set(tokenize(self.texts[record_id])):
+                self.postings.setdefault(token, set()).add(record_id)
+        self.vocabulary = sorted(self.postings)
+
+    @classmethod
+    def from_soup(cls, soup, fingerprint=''):
+        records = []
+        record = None
+        for element in soup.find_all(['h2', 'h3', 'h4', 'p']):
+            text = element.get_text(' ', strip=True)
+            if not text:
+                continue
+            if element.name != 'p':
+                record = dict.fromkeys(GOOGLE_CLOUD_FIELDS, '')
+                record['name'] = text
+                records.append(record)
+                continue
+            if record is None:
+                continue
+            
+            label = GOOGLE_CLOUD_LABEL_PATTERN.match(text)
+            field = GOOGLE_CLOUD_LABELS[label.group(1).lower()] if label else 'description'
+            value = text[label.end():] if label else text
+            if value and not record[field]:
+                record[field] = value[:500] + '...' if len(value) > 500 else value
+        
+        actors = [record for record in records if record['attribution'] or record['targets'] or record['malware'] or record['name'].lower() in record['description'].lower()]
+        return cls(actors, fingerprint)
+
+    def to_dict(self):
+        return {
+            'fingerprint': self.fingerprint,
+            'records': [[record[field] for field in GOOGLE_CLOUD_FIELDS] for record in self.records]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([dict(zip(GOOGLE_CLOUD_FIELDS, values)) for values in data['records']], data.get('fingerprint', ''))
+
+    def candidates(self, word):
+        record_ids = set()
+        position = bisect_left(self.vocabulary, word)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(word):
+            record_ids |= self.postings[self.vocabulary[position]]
+            position += 1
+        return record_ids
+
+    def search(self, apt_name):
+        query = apt_name.strip().lower()
+        words = tokenize(query)
+        if not words:
+            return []
+        
+        exact = self.names.get(normalize_alias(query), [])
+        record_ids = set.intersection(*(self.candidates(word) for word in words))
+        matches = [record_id for record_id in record_ids if query in self.texts[record_id] and record_id not in exact]
+        matches.sort(key=lambda record_id: (query not in self.records[record_id]['name'].lower(), record_id))
+        return [dict(self.records[record_id]) for record_id in exact + matches]
+
+class MalpediaCatalogue:
+    def __init__(self, actors=None, listed_at=0):
+        self.actors = actors or {}
+        self.listed_at = listed_at
+        self.build_aliases()
+
+    def build_aliases(self):
+        self.matcher = None
+        self.aliases = {}
+        for slug, actor in self.actors.items():
+            for alias in [actor.get('name') or ''] + actor.get('synonyms', []):
+                key = normalize_alias(alias)
+                if key:
+                    self.aliases.setdefault(key, slug)
+        for slug in self.actors:
+            self.aliases.setdefault(normalize_alias(slug), slug)
+
+    def resolve(self, apt_name):
+        slug = self.aliases.get(normalize_alias(apt_name))
+        if slug:
+            return slug
+        if self.matcher is None:
+            self.matcher = NameMatcher((slug, [actor.get('name'), slug] + actor.get('synonyms', [])) for slug, actor in self.actors.items())
+        return self.matcher.best(apt_name)
+
+    def update_listing(self, slugs):
+        listed = set(slugs)
+        self.actors = {slug: actor for slug, actor in self.actors.items() if slug in listed}
+        for slug in slugs:
+            self.actors.setdefault(slug, {'name': '', 'synonyms': [], 'fetched_at': 0})
+        self.listed_at = time.time()
+        self.build_aliases()
+
+    def refresh_slugs(self, max_age):
+        now = time.time()
+        stale = sorted((actor.get('fetched_at', 0), slug) for slug, actor in self.actors.items() if now - actor.get('fetched_at', 0) > max_age)
+        return [slug for fetched_at, slug in stale]
+
+    def update_actor(self, slug, details):
+        self.actors[slug] = {
+            'name': details.get('value') or '',
+            'synonyms': (details.get('meta') or {}).get('synonyms') or [],
+            'fetched_at': time.time()
+        }
+        for alias in [self.actors[slug]['name']] + self.actors[slug]['synonyms']:
+            key = normalize_alias(alias)
+            if key:
+                self.aliases.setdefault(key, slug)
+
+    def to_dict(self):
+        return {'listed_at': self.listed_at, 'actors': self.actors}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['actors'], data.get('listed_at', 0))
+
+class EtdaStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = None
+        self.matcher = None
+        import sqlite3
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS etda_groups (
+                url TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                names TEXT,
+                country TEXT,
+                motivation TEXT,
+                first_seen TEXT,
+                data TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                synced_at REAL
+            )
+        ''')
+        self.connection.commit()
+
+    def count(self):
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM etda_groups').fetchone()[0]
+
+    def validators(self, url):
+        with self.lock:
+            row = self.connection.execute('SELECT etag, last_modified, content_hash FROM etda_groups WHERE url = ?', (url,)).fetchone()
+        if not row:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'content_hash': row[2]}
+
+    def upsert(self, url, title, apt_data, etag, last_modified, content_hash):
+        with self.lock:
+            self.connection.execute('''
+                INSERT OR REPLACE INTO etda_groups (url, title, names, country, motivation, first_seen, data, etag, last_modified, content_hash, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (url, title, apt_data.get('names'), apt_data.get('country'), apt_data.get('motivation'), apt_data.get('first_seen'),
+                  json.dumps(apt_data, ensure_ascii=False), etag, last_modified, content_hash, time.time()))
+            self.connection.commit()
+            self.entries = None
+
+    def touch(self, url, etag=None, last_modified=None):
+        with self.lock:
+            self.connection.execute('''
+                UPDATE etda_groups SET synced_at = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?
+            ''', (time.time(), etag, last_modified, url))
+            self.connection.commit()
+
+    def remove_missing(self, urls):
+        with self.lock:
+            stored = [row[0] for row in self.connection.execute('SELECT url FROM etda_groups')]
+            missing = [url for url in stored if url not in urls]
+            self.connection.executemany('DELETE FROM etda_groups WHERE url = ?', [(url,) for url in missing])
+            self.connection.commit()
+            self.entries = None
+        return len(missing)
+
+    def load_entries(self):
+        with self.lock:
+            if self.entries is None:
+                self.entries = [(url, title, names or '') for url, title, names in self.connection.execute('SELECT url, title, names FROM etda_groups')]
+            return self.entries
+
+    def get(self, url):
+        with self.lock:
+            row = self.connection.execute('SELECT data FROM etda_groups WHERE url = ?', (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, apt_name):
+        with self.lock:
+            matcher = self.matcher if self.entries is not None else None
+        if matcher is None:
+            matcher = NameMatcher((url, split_etda_names(title) + split_etda_names(names)) for url, title, names in self.load_entries())
+            with self.lock:
+                self.matcher = matcher
+        matches = matcher.top(apt_name, 1)
+        return self.get(matches[0][0]) if matches else None
+
+def split_etda_names(text):
+    text = re.sub(r'\([^)]*\)', ',', text or '')
+    return [name.strip() for name in re.split(r'[,;]', text) if name.strip() and name.strip() != 'Not found']
+
+class AliasGraph:
+    def __init__(self, actors, aliases):
+        self.actors = actors
+        self.aliases = aliases
+        self.matcher = None
+
+    @classmethod
+    def build(cls, mitre_index=None, etda_entries=None, malpedia_catalogue=None):
+        records = []
+        if mitre_index:
+            for group_id, group in mitre_index.groups.items():
+                records.append(('mitre', group_id, group['name'], [group['name']] + group['associated_groups'].split(', ')))
+        for url, title, names in etda_entries or []:
+            etda_aliases = split_etda_names(title) + split_etda_names(names)
+            if etda_aliases:
+                records.append(('etda', url, etda_aliases[0], etda_aliases))
+        if malpedia_catalogue:
+            for slug, actor in malpedia_catalogue.actors.items():
+                records.append(('malpedia', slug, actor.get('name') or slug, [actor.get('name') or '', slug] + actor.get('synonyms', [])))
+        
+        owners = {}
+        for record_id, (source, identifier, name, names) in enumerate(records):
+            for alias in names:
+                key = normalize_alias(alias)
+                if len(key) >= 3 and not key.isdigit():
+                    owners.setdefault(key, {}).setdefault(source, set()).add(record_id)
+        
+        parents = list(range(len(records)))
+        
+        def find(record_id):
+            while parents[record_id] != record_id:
+                parents[record_id] = parents[parents[record_id]]
+                record_id = parents[record_id]
+            return record_id
+        
+        ambiguous = set()
+        for key, by_source in owners.items():
+            if any(len(record_ids) > 1 for record_ids in by_source.values()):
+                ambiguous.add(key)
+                continue
+            record_ids = [record_id for ids in by_source.values() for record_id in ids]
+            for record_id in record_ids[1:]:
+                parents[find(record_id)] = find(record_ids[0])
+        
+        components = {}
+        for record_id, (source, identifier, name, names) in enumerate(records):
+            actor = components.setdefault(find(record_id), {'canonical': '', 'aliases': [], 'mitre': [], 'etda': [], 'malpedia': []})
+            actor[source].append(identifier)
+            for alias in names:
+                if alias and alias not in actor['aliases']:
+                    actor['aliases'].append(alias)
+            if source == 'mitre' or not actor['canonical'] or (source == 'malpedia' and not actor['mitre']):
+                actor['canonical'] = name
+        
+        actors = list(components.values())
+        aliases = {}
+        for actor_id, actor in enumerate(actors):
+            for alias in actor['aliases']:
+                key = normalize_alias(alias)
+                if key and key not in ambiguous:
+                    aliases.setdefault(key, actor_id)
+        
+        return cls(actors, aliases)
+
+    def resolve(self, apt_name, fuzzy=True):
+        actor_id = self.aliases.get(normalize_alias(apt_name))
+        if actor_id is None and fuzzy:
+            if self.matcher is None:
+                self.matcher = NameMatcher((actor_id, actor['aliases']) for actor_id, actor in enumerate(self.actors))
+            actor_id = self.matcher.best(apt_name)
+        return self.actors[actor_id] if actor_id is not None else None
+
+class LinkValidationCache:
+    def __init__(self, path, ttl=LINK_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, url):
+        with self.lock:
+            entry = self.entries.get(url)
+        if entry and time.time() - entry['checked_at'] < self.ttl:
+            return entry['alive']
+        return None
+
+    def set(self, url, alive):
+        with self.lock:
+            self.entries[url] = {'alive': alive, 'checked_at': time.time()}
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            now = time.time()
+            entries = {url: entry for url, entry in self.entries.items() if now - entry['checked_at'] < self.ttl}
+            self.entries = entries
+            self.dirty = False
+        try:
+            write_file_atomic(self.path, json.dumps(entries).encode('utf-8'))
+        except OSError:
+            pass
+
+def query_shape(apt_name):
+    compact = normalize_alias(apt_name)
+    if re.fullmatch(r'apt\d+', compact):
+        return 'apt_number'
+    if re.fullmatch(r'[a-z]+\d+[a-z0-9]*', compact):
+        return 'code'
+    if len(apt_name.split()) > 1:
+        return 'multi_word'
+    return 'word'
+
+class SourceScheduler:
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.saved_at = 0
+        self.stats = {}
+        if path:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.stats = json.load(f).get('sources', {})
+            except (OSError, ValueError, AttributeError):
+                self.stats = {}
+
+    def record(self, source, shape, elapsed, hit):
+        with self.lock:
+            for key in (shape, 'all'):
+                row = self.stats.setdefault(source, {}).setdefault(key, {'latency': elapsed, 'hit_rate': 1.0 if hit else 0.0, 'samples': 0, 'skipped': 0})
+                if row['samples']:
+                    row['latency'] += SCHEDULER_ALPHA * (elapsed - row['latency'])
+                    row['hit_rate'] += SCHEDULER_ALPHA * ((1.0 if hit else 0.0) - row['hit_rate'])
+                row['samples'] += 1
+                row['skipped'] = 0
+            self.dirty = True
+
+    def estimate(self, source, shape):
+        rows = self.stats.get(source, {})
+        for key in (shape, 'all'):
+            row = rows.get(key)
+            if row and row['samples'] >= SCHEDULER_MIN_SAMPLES:
+                return row
+        return None
+
+    def plan(self, sources, apt_name, deadline=None):
+        shape = query_shape(apt_name)
+        ranked = []
+        pruned = []
+        
+        with self.lock:
+            for position, source in enumerate(sources):
+                row = self.estimate(source, shape)
+                if row is None:
+                    ranked.append((float('inf'), position, source))
+                    continue
+                
+                unlikely = bool(deadline) and (row['hit_rate'] < SCHEDULER_MIN_HIT_RATE or row['latency'] > deadline * 1.5)
+                shape_row = self.stats[source].get(shape) or row
+                if unlikely and shape_row['skipped'] < SCHEDULER_EXPLORE_EVERY:
+                    shape_row['skipped'] += 1
+                    self.dirty = True
+                    pruned.append(source)
+                    continue
+                ranked.append((row['hit_rate'] / max(row['latency'], 0.05), position, source))
+        
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [source for value, position, source in ranked], pruned
+
+    def save(self, force=False):
+        if not self.path:
+            return
+        with self.lock:
+            if not self.dirty or (not force and time.time() - self.saved_at < SCHEDULER_SAVE_INTERVAL):
+                return
+            document = json.dumps({'updated_at': time.time(), 'sources': self.stats}).encode('utf-8')
+            self.dirty = False
+            self.saved_at = time.time()
+        try:
+            write_file_atomic(self.path, document)
+        except OSError:
+            pass
+
+    def format_stats(self):
+        output = []
+        output.append(f"{CYAN}{'Source':<14}{'Shape':<12}{'Samples':>9}{'Hit rate':>10}{'Latency s':>11}{'Value/s':>10}{ENDC}")
+        with self.lock:
+            for source in SOURCE_ORDER:
+                for shape, row in sorted(self.stats.get(source, {}).items()):
+                    value = row['hit_rate'] / max(row['latency'], 0.05)
+                    output.append(f"{source:<14}{shape:<12}{row['samples']:>9}{row['hit_rate']:>10.0%}{row['latency']:>11.2f}{value:>10.2f}")
+        return "\n".join(output)
+
+class SearchResults(tuple):
+    def __new__(cls, values, statuses):
+        results = super().__new__(cls, values)
+        results.statuses = statuses
+        return results
+
+    @property
+    def complete(self):
+        return not INCOMPLETE_STATUSES.intersection(self.statuses.values())
+
 class APTSearcher:
-    def __init__(self):
+    def __init__(self, max_workers=None, verbose=True, cache_dir=CACHE_DIR, cache_ttls=None, mitre_stix_path=None, trace=False, source_policies=None, probe_workers=16, link_check_limit=8, malpedia_sync_limit=8, shared_ttl=None, serve_stale=False, sources=None, mitre_detail_limit=10, mitre_detail_workers=6, deadline=None):
         self.base_url = "https://apt.etda.or.th"
         self.search_url = "https://apt.etda.or.th/cgi-bin/aptsearch.cgi"
         self.listgroups_url = "https://apt.etda.or.th/cgi-bin/listgroups.cgi"
@@ -41,6 +1286,8 @@ class APTSearcher:
         self.malpedia_base = "https://malpedia.caad.fkie.fraunhofer.de"
         self.mitre_base = "https://attack.mitre.org"
         self.mitre_groups_url = "https://attack.mitre.org/groups/"
+        self.mitre_stix_url = "https://raw.githubusercontent.com/mitre-attack/attack-stix-data/master/enterprise-attack/enterprise-attack.json"
+        self.mitre_stix_path = mitre_stix_path
         self.pulsedive_base = "https://pulsedive.com"
         self.qianxin_base = "https://ti.qianxin.com"
         self.qianxin_apt_url = "https://ti.qianxin.com/apt/apt"
@@ -50,54 +1297,242 @@ class APTSearcher:
         self.netenrich_base = "https://know.netenrich.com"
         self.netenrich_search_url = "https://know.netenrich.com/content/search"
         
+        self.sources = [name for name in SOURCE_ORDER if name in sources] if sources else list(SOURCE_ORDER)
+        unknown = set(sources or []) - set(SOURCE_ORDER)
+        if unknown:
+            raise ValueError(f"unknown source(s): {', '.join(sorted(unknown))}")
+        if max_workers is None:
+            max_workers = len(self.sources)
+        
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive'
         })
+        
+        self.cache_dir = cache_dir
+        self.cache_ttls = dict(CACHE_TTLS)
+        if cache_ttls:
+            self.cache_ttls.update(cache_ttls)
+        self.response_cache = ResponseCache(os.path.join(cache_dir, 'http')) if cache_dir else None
+        self.link_cache = LinkValidationCache(os.path.join(cache_dir, 'link_status.json')) if cache_dir else None
+        self.scheduler = SourceScheduler(os.path.join(cache_dir, SOURCE_STATS_NAME) if cache_dir else None)
+        self.link_check_limit = link_check_limit
+        self.link_check_semaphore = threading.BoundedSemaphore(link_check_limit)
+        self.malpedia_sync_semaphore = threading.BoundedSemaphore(malpedia_sync_limit)
+        self.mitre_detail_limit = mitre_detail_limit
+        self.mitre_detail_workers = mitre_detail_workers
+        self.deadline = deadline
+        self.source_policies = {source: dict(policy) for source, policy in SOURCE_POLICIES.items()}
+        for source, policy in (source_policies or {}).items():
+            self.source_policies.setdefault(source, {}).update(policy)
+        self.tracer = SearchTracer() if trace else None
+        if self.tracer:
+            SearchTracer.install()
+        self.pool_maxsize = max_workers + probe_workers
+        self.mount_adapters()
+        
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='apt-source')
+        self.probe_executor = ThreadPoolExecutor(max_workers=probe_workers, thread_name_prefix='apt-probe')
+        self.verbose = verbose
+        self.html_parser = None
+        
+        self.shared_data = {}
+        self.shared_loaded_at = {}
+        self.shared_failed_at = {}
+        self.shared_locks = {}
+        self.shared_lock = threading.Lock()
+        self.shared_ttl = shared_ttl
+        self.serve_stale = serve_stale
+        self.abandoned = {}
+        self.abandoned_lock = threading.Lock()
+        self.alias_graph = None
+        self.alias_graph_keys = [key if source in self.sources else None for source, key in (('mitre', 'mitre_index'), ('etda', 'etda_store'), ('malpedia', 'malpedia_catalogue'))]
+        self.alias_graph_inputs = (None, None, None)
+        self.alias_graph_lock = threading.Lock()
+
+    def mount_adapters(self):
+        self.adapters = {}
+        self.session.mount('https://', CachingAdapter(self.response_cache, DEFAULT_CACHE_TTL, self.tracer, self.source_policies.get('default'), pool_maxsize=self.pool_maxsize))
+        for source in self.sources:
+            for host in SOURCE_PLUGINS[source].hosts:
+                if host in self.adapters:
+                    continue
+                ttl = self.cache_ttls.get(source, DEFAULT_CACHE_TTL)
+                self.adapters[host] = CachingAdapter(self.response_cache, ttl, self.tracer, self.source_policies.get(source), pool_connections=2, pool_maxsize=self.pool_maxsize)
+                self.session.mount(f'https://{host}/', self.adapters[host])
+
+    def parse_html(self, content, only=None):
+        from bs4 import BeautifulSoup, SoupStrainer
+        
+        if self.html_parser is None:
+            self.html_parser = html_parser_name()
+        parse_only = SoupStrainer(only) if only else None
+        if self.tracer is None:
+            return BeautifulSoup(content, self.html_parser, parse_only=parse_only)
+        
+        start = time.perf_counter()
+        soup = BeautifulSoup(content, self.html_parser, parse_only=parse_only)
+        self.tracer.record('parse', parser=self.html_parser, only=only, bytes=len(content), parse_ms=(time.perf_counter() - start) * 1000)
+        return soup
+
+    def record_error(self, error, source=None):
+        if self.tracer:
+            self.tracer.record('error', source=source, function=sys._getframe(1).f_code.co_name, error=repr(error))
+
+    def submit_probe(self, function, *args):
+        source = current_source()
+        
+        def run():
+            trace_context.source = source
+            try:
+                return function(*args)
+            finally:
+                trace_context.source = None
+        
+        return self.probe_executor.submit(run)
+
+    def first_success(self, futures):
+        try:
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as error:
+                    self.record_error(error)
+                    continue
+                if result:
+                    return result
+            return None
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def log(self, message):
+        if self.verbose:
+            safe_print(message)
+
+    def shared_fresh(self, key, expires):
+        if key not in self.shared_data:
+            return False
+        return not expires or self.shared_ttl is None or time.time() - self.shared_loaded_at[key] < self.shared_ttl
+
+    def shared_failed(self, key):
+        return time.time() - self.shared_failed_at.get(key, 0) < SHARED_FAILURE_TTL
+
+    def fetch_shared(self, key, loader, expires=True):
+        with self.shared_lock:
+            if self.shared_fresh(key, expires):
+                return self.shared_data[key]
+            if self.shared_failed(key):
+                return self.shared_data.get(key)
+            key_lock = self.shared_locks.setdefault(key, threading.Lock())
+            stale = self.shared_data.get(key) if self.serve_stale else None
+        
+        if stale is not None:
+            if key_lock.acquire(blocking=False):
+                self.probe_executor.submit(self.reload_shared, key, loader, key_lock)
+            return stale
+        
+        with key_lock:
+            with self.shared_lock:
+                if self.shared_fresh(key, expires):
+                    return self.shared_data[key]
+                if self.shared_failed(key):
+                    return self.shared_data.get(key)
+            
+            value = loader()
+            with self.shared_lock:
+                if value:
+                    self.shared_data[key] = value
+                    self.shared_loaded_at[key] = time.time()
+                    self.shared_failed_at.pop(key, None)
+                else:
+                    self.shared_failed_at[key] = time.time()
+                    if key in self.shared_data:
+                        return self.shared_data[key]
+            return value
+
+    def reload_shared(self, key, loader, key_lock):
+        try:
+            value = loader()
+            with self.shared_lock:
+                if value:
+                    self.shared_data[key] = value
+                    self.shared_loaded_at[key] = time.time()
+                    self.shared_failed_at.pop(key, None)
+                else:
+                    self.shared_failed_at[key] = time.time()
+        except Exception as error:
+            self.record_error(error)
+        finally:
+            key_lock.release()
+
+    def shared_keys(self):
+        with self.shared_lock:
+            return sorted(self.shared_data)
+
+    def clear_shared(self, *keys):
+        with self.shared_lock:
+            for key in keys or set(self.shared_data) | set(self.shared_failed_at):
+                self.shared_data.pop(key, None)
+                self.shared_loaded_at.pop(key, None)
+                self.shared_failed_at.pop(key, None)
+
+    def warm_up(self):
+        loaders = {key: getattr(self, loader) for source in self.sources for key, loader in SOURCE_PLUGINS[source].indexes.items()}
+        futures = [self.executor.submit(self.fetch_shared, key, loader) for key, loader in loaders.items()]
+        for future in futures:
+            future.result()
+        if 'etda' in self.sources:
+            self.get_etda_store()
+        return self.load_alias_graph()
 
     def search_google_cloud_apt(self, apt_name):
+        self.log(f"{CYAN}Searching Google Cloud APT Groups database...{ENDC}")
+        google_cloud_index = self.fetch_shared('google_cloud_index', self.load_google_cloud_index)
+        if not google_cloud_index:
+            return []
+        
+        apt_sections = google_cloud_index.search(apt_name)
+        for apt_info in apt_sections:
+            apt_info['source_url'] = self.google_cloud_apt_url
+        return apt_sections
+
+    def load_google_cloud_index(self):
         try:
-            print(f"{CYAN}Searching Google Cloud APT Groups database...{ENDC}")
-            
             response = self.session.get(self.google_cloud_apt_url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            apt_sections = []
-            
-            for section in soup.find_all(['div', 'section', 'article']):
-                section_text = section.get_text().lower()
-                if apt_name.lower() in section_text:
-                    apt_info = {
-                        'name': apt_name,
-                        'description': '',
-                        'attribution': '',
-                        'targets': '',
-                        'malware': '',
-                        'source_url': self.google_cloud_apt_url
-                    }
-                    
-                    paragraphs = section.find_all('p')
-                    for p in paragraphs:
-                        text = p.get_text(strip=True)
-                        if apt_name.lower() in text.lower():
-                            apt_info['description'] = text[:500] + '...' if len(text) > 500 else text
-                            break
-                    
-                    if apt_info['description']:
-                        apt_sections.append(apt_info)
+            fingerprint = hashlib.sha1(response.content).hexdigest()
+            index_path = os.path.join(self.cache_dir, GOOGLE_CLOUD_INDEX_NAME) if self.cache_dir else None
             
-            return apt_sections
-        except:
-            return []
+            if index_path and os.path.exists(index_path):
+                try:
+                    with open(index_path, 'r', encoding='utf-8') as f:
+                        stored = json.load(f)
+                    if stored.get('fingerprint') == fingerprint:
+                        return GoogleCloudActorIndex.from_dict(stored)
+                except (OSError, ValueError, KeyError):
+                    pass
+            
+            soup = self.parse_html(response.content, only=['h2', 'h3', 'h4', 'p'])
+            google_cloud_index = GoogleCloudActorIndex.from_soup(soup, fingerprint)
+            if index_path:
+                write_file_atomic(index_path, json.dumps(google_cloud_index.to_dict(), ensure_ascii=False).encode('utf-8'))
+            return google_cloud_index
+        except Exception as error:
+            self.record_error(error)
+            return None
 
     def search_netenrich(self, apt_name):
         try:
-            print(f"{CYAN}Searching NetEnrich Knowledge Base...{ENDC}")
+            self.log(f"{CYAN}Searching NetEnrich Knowledge Base...{ENDC}")
             
             search_params = {'query': apt_name}
             response = self.session.get(self.netenrich_search_url, params=search_params)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content, only=['a', 'div', 'article'])
             netenrich_links = []
             
             for link in soup.find_all('a', href=True):
@@ -145,19 +1580,20 @@ class APTSearcher:
                     unique_links.append(link)
             
             return unique_links[:10]
-        except:
+        except Exception as error:
+            self.record_error(error)
             return []
 
     def search_socradar(self, apt_name):
         try:
-            print(f"{CYAN}Searching SOCRadar Threat Intelligence...{ENDC}")
+            self.log(f"{CYAN}Searching SOCRadar Threat Intelligence...{ENDC}")
             
             search_query = apt_name.lower().replace(" ", "+")
             search_url = f"{self.socradar_search_url}?s={search_query}"
             
             response = self.session.get(search_url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content, only=['article', 'div'])
             socradar_articles = []
             
             articles = soup.find_all('article') or soup.find_all('div', class_=['post', 'entry', 'search-result'])
@@ -206,7 +1642,8 @@ class APTSearcher:
                 socradar_articles = self.search_socradar_alternative(apt_name)
             
             return socradar_articles[:10]
-        except:
+        except Exception as error:
+            self.record_error(error)
             return []
 
     def search_socradar_alternative(self, apt_name):
@@ -216,7 +1653,7 @@ class APTSearcher:
             response = self.session.get(category_url)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = self.parse_html(response.content, only='a')
                 
                 for link in soup.find_all('a', href=True):
                     link_text = link.get_text(strip=True).lower()
@@ -232,90 +1669,129 @@ class APTSearcher:
                         })
             
             return articles
-        except:
+        except Exception as error:
+            self.record_error(error)
             return []
 
     def search_qianxin(self, apt_name):
         try:
-            print(f"{CYAN}Searching QiAnXin Threat Intelligence...{ENDC}")
+            self.log(f"{CYAN}Searching QiAnXin Threat Intelligence...{ENDC}")
+            
+            qianxin_page = self.fetch_shared('qianxin_page', self.load_qianxin_page)
+            if not qianxin_page:
+                return []
+            apt_links = [urljoin(self.qianxin_base, href) for href, score, name in qianxin_page['matcher'].top(apt_name, None, FUZZY_RESOLVE_THRESHOLD)]
+            
+            for href, link_text in qianxin_page['links']:
+                if '/apt/detail/' in href and apt_name.lower() in href.lower():
+                    apt_links.append(urljoin(self.qianxin_base, href))
             
+            if not apt_links and apt_name.lower() in qianxin_page['text']:
+                query = normalize_alias(apt_name)
+                detail_links = []
+                for href, link_text in qianxin_page['links']:
+                    if '/apt/detail/' not in href:
+                        continue
+                    slug = normalize_alias(urllib.parse.unquote(href.rstrip('/').rsplit('/', 1)[-1]))
+                    label = normalize_alias(link_text)
+                    if query and (query in label or query in slug or (len(label) >= 3 and label in query)):
+                        detail_links.append(urljoin(self.qianxin_base, href))
+                apt_links = self.validate_links(detail_links)
+            
+            return list(dict.fromkeys(apt_links))
+        except Exception as error:
+            self.record_error(error)
+            return []
+
+    def validate_links(self, urls):
+        urls = list(dict.fromkeys(urls))
+        statuses = {}
+        unchecked = []
+        
+        for url in urls:
+            alive = self.link_cache.get(url) if self.link_cache else None
+            if alive is None:
+                unchecked.append(url)
+            else:
+                statuses[url] = alive
+        
+        if unchecked:
+            def check(url):
+                with self.link_check_semaphore:
+                    response = self.session.head(url, allow_redirects=True)
+                    return response.status_code
+            
+            futures = {self.submit_probe(check, url): url for url in unchecked}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    status_code = future.result()
+                except Exception as error:
+                    self.record_error(error)
+                    continue
+                statuses[url] = status_code == 200
+                if self.link_cache and (status_code == 200 or 400 <= status_code < 500):
+                    self.link_cache.set(url, status_code == 200)
+            
+            if self.link_cache:
+                self.link_cache.save()
+        
+        return [url for url in urls if statuses.get(url)]
+
+    def load_qianxin_page(self):
+        try:
             response = self.session.get(self.qianxin_apt_url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            apt_links = []
+            soup = self.parse_html(response.content)
             
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')
-                link_text = link.get_text(strip=True).lower()
-                
-                if '/apt/detail/' in href and apt_name.lower() in link_text:
-                    full_url = urljoin(self.qianxin_base, href)
-                    apt_links.append(full_url)
-                elif '/apt/detail/' in href and apt_name.lower() in href.lower():
-                    full_url = urljoin(self.qianxin_base, href)
-                    apt_links.append(full_url)
-            
-            if not apt_links:
-                page_text = soup.get_text().lower()
-                if apt_name.lower() in page_text:
-                    for link in soup.find_all('a', href=True):
-                        href = link.get('href')
-                        if '/apt/detail/' in href:
-                            full_url = urljoin(self.qianxin_base, href)
-                            try:
-                                test_response = self.session.head(full_url, allow_redirects=True)
-                                if test_response.status_code == 200:
-                                    apt_links.append(full_url)
-                            except:
-                                continue
-            
-            return list(set(apt_links))
-        except:
-            return []
+            links = [(link.get('href'), link.get_text(strip=True).lower()) for link in soup.find_all('a', href=True)]
+            return {
+                'links': links,
+                'text': soup.get_text().lower(),
+                'matcher': NameMatcher((href, [link_text]) for href, link_text in links if '/apt/detail/' in href)
+            }
+        except Exception as error:
+            self.record_error(error)
+            return None
 
     def search_pulsedive(self, apt_name):
         try:
-            print(f"{CYAN}Searching Pulsedive database...{ENDC}")
+            self.log(f"{CYAN}Searching Pulsedive database...{ENDC}")
             
-            search_variations = [
+            search_variations = list(dict.fromkeys([
                 apt_name.lower().replace(" ", ""),
                 apt_name.lower().replace(" ", "-"),
                 apt_name.lower(),
                 apt_name.replace(" ", ""),
                 apt_name.replace(" ", "_"),
-            ]
-            
-            pulsedive_url = None
-            
-            for variant in search_variations:
-                threat_url = f"{self.pulsedive_base}/threat/{variant}"
-                try:
-                    response = self.session.get(threat_url)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        if self.is_valid_pulsedive_page(soup):
-                            pulsedive_url = threat_url
-                            break
-                except:
-                    continue
-                
-                try:
-                    search_url = f"{self.pulsedive_base}/search"
-                    search_params = {'q': apt_name, 'type': 'threat'}
-                    response = self.session.get(search_url, params=search_params)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        search_results = self.extract_pulsedive_search_results(soup, apt_name)
-                        if search_results:
-                            pulsedive_url = search_results[0]
-                            break
-                except:
-                    continue
+            ]))
             
-            return pulsedive_url
-        except:
+            futures = [self.submit_probe(self.probe_pulsedive_threat, f"{self.pulsedive_base}/threat/{variant}") for variant in search_variations]
+            futures.append(self.submit_probe(self.probe_pulsedive_search, apt_name))
+            return self.first_success(futures)
+        except Exception as error:
+            self.record_error(error)
             return None
 
+    def probe_pulsedive_threat(self, threat_url):
+        response = self.session.get(threat_url)
+        if response.status_code == 200:
+            soup = self.parse_html(response.content)
+            if self.is_valid_pulsedive_page(soup):
+                return threat_url
+        return None
+
+    def probe_pulsedive_search(self, apt_name):
+        search_url = f"{self.pulsedive_base}/search"
+        search_params = {'q': apt_name, 'type': 'threat'}
+        response = self.session.get(search_url, params=search_params)
+        if response.status_code == 200:
+            soup = self.parse_html(response.content, only='a')
+            search_results = self.extract_pulsedive_search_results(soup, apt_name)
+            if search_results:
+                return search_results[0]
+        return None
+
     def is_valid_pulsedive_page(self, soup):
         indicators = [
             soup.find('div', class_='threat-header'),
@@ -334,14 +1810,94 @@ class APTSearcher:
                 results.append(full_url)
         return results
 
-    def search_mitre_attack(self, apt_name):
+    def search_mitre_attack(self, apt_name, detail_limit=None):
         try:
-            print(f"{CYAN}Searching MITRE ATT&CK database...{ENDC}")
+            self.log(f"{CYAN}Searching MITRE ATT&CK database...{ENDC}")
+            if detail_limit is None:
+                detail_limit = self.mitre_detail_limit
+            
+            mitre_index = self.fetch_shared('mitre_index', self.load_mitre_index)
+            if mitre_index:
+                matching_groups = self.rank_mitre_groups(apt_name, [mitre_index.groups[group_id] for group_id in mitre_index.match_ids(apt_name)])
+                return [mitre_index.copy_group(group['id']) for group in matching_groups]
+            
+            mitre_groups = self.fetch_shared('mitre_groups', self.load_mitre_groups) or []
+            matching_groups = []
+            
+            for group in mitre_groups:
+                search_text = f"{group['name']} {group['associated_groups']}".lower()
+                if apt_name.lower() in search_text:
+                    matching_groups.append(group)
             
+            mitre_data = [self.mitre_stub(group) for group in self.rank_mitre_groups(apt_name, matching_groups)]
+            return self.expand_mitre_groups(mitre_data, detail_limit)
+        except Exception as error:
+            self.record_error(error)
+            return []
+
+    def get_mitre_group(self, group_id):
+        group_id = group_id.upper()
+        mitre_index = self.fetch_shared('mitre_index', self.load_mitre_index)
+        if mitre_index:
+            return mitre_index.copy_group(group_id) if group_id in mitre_index.groups else None
+        
+        mitre_groups = self.fetch_shared('mitre_groups', self.load_mitre_groups) or []
+        for group in mitre_groups:
+            if group['id'] == group_id:
+                return self.expand_mitre_groups([self.mitre_stub(group)])[0]
+        return None
+
+    def rank_mitre_groups(self, apt_name, groups):
+        if len(groups) < 2:
+            return groups
+        matcher = NameMatcher((position, [group['name']] + group['associated_groups'].split(', ')) for position, group in enumerate(groups))
+        scores = matcher.score_names(apt_name, 0)
+        return [group for position, group in sorted(enumerate(groups), key=lambda item: (-scores.get(item[0], (0, None))[0], item[0]))]
+
+    def mitre_stub(self, group):
+        return {
+            'url': group.get('url') or f"{self.mitre_base}/groups/{group['id']}/",
+            'techniques': [],
+            'id': group['id'],
+            'name': group['name'],
+            'associated_groups': group['associated_groups'],
+            'description': group['description'],
+            'details_pending': True
+        }
+
+    def expand_mitre_groups(self, mitre_data, limit=None):
+        pending = [group for group in mitre_data if group.get('details_pending')]
+        if limit:
+            pending = pending[:limit]
+        if not pending:
+            return mitre_data
+        
+        self.log(f"{CYAN}Fetching details for {len(pending)} MITRE group(s)...{ENDC}")
+        limiter = threading.BoundedSemaphore(self.mitre_detail_workers)
+        
+        def load(group_id):
+            with limiter:
+                return self.scrape_mitre_group_details(group_id)
+        
+        futures = [(group, self.submit_probe(load, group['id'])) for group in pending]
+        for group, future in futures:
+            try:
+                details = future.result()
+            except Exception as error:
+                self.record_error(error)
+                details = None
+            if details:
+                group.update(details)
+                group.pop('details_pending', None)
+        
+        return mitre_data
+
+    def load_mitre_groups(self):
+        try:
             response = self.session.get(self.mitre_groups_url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            matching_groups = []
+            soup = self.parse_html(response.content, only='table')
+            mitre_groups = []
             tables = soup.find_all('table')
             
             for table in tables:
@@ -349,37 +1905,70 @@ class APTSearcher:
                 for row in rows:
                     cells = row.find_all('td')
                     if len(cells) >= 4:
-                        group_id = cells[0].get_text(strip=True)
-                        group_name = cells[1].get_text(strip=True)
-                        associated_groups = cells[2].get_text(strip=True)
-                        description = cells[3].get_text(strip=True)
-                        
-                        search_text = f"{group_name} {associated_groups}".lower()
-                        if apt_name.lower() in search_text:
-                            matching_groups.append({
-                                'id': group_id,
-                                'name': group_name,
-                                'associated_groups': associated_groups,
-                                'description': description
-                            })
-            
-            mitre_data = []
-            for group in matching_groups:
-                detailed_info = self.get_mitre_group_details(group['id'])
-                if detailed_info:
-                    detailed_info.update(group)
-                    mitre_data.append(detailed_info)
+                        mitre_groups.append({
+                            'id': cells[0].get_text(strip=True),
+                            'name': cells[1].get_text(strip=True),
+                            'associated_groups': cells[2].get_text(strip=True),
+                            'description': cells[3].get_text(strip=True)
+                        })
             
-            return mitre_data
-        except:
-            return []
+            return mitre_groups
+        except Exception as error:
+            self.record_error(error)
+            return None
+
+    def load_mitre_index(self):
+        try:
+            source = os.path.abspath(self.mitre_stix_path) if self.mitre_stix_path else self.mitre_stix_url
+            index_path = os.path.join(self.cache_dir, 'mitre_index.json') if self.cache_dir else None
+            
+            if index_path and os.path.exists(index_path):
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                if stored.get('source') == source:
+                    if self.mitre_stix_path:
+                        fresh = stored.get('built_at', 0) >= os.path.getmtime(source)
+                    else:
+                        fresh = time.time() - stored.get('built_at', 0) < self.cache_ttls.get('mitre', DEFAULT_CACHE_TTL)
+                    if fresh:
+                        return MitreAttackIndex(stored['groups'])
+            
+            self.log(f"{CYAN}Building MITRE ATT&CK index from STIX bundle...{ENDC}")
+            if self.mitre_stix_path:
+                with open(source, 'r', encoding='utf-8') as f:
+                    bundle = json.load(f)
+            else:
+                response = self.session.get(self.mitre_stix_url)
+                response.raise_for_status()
+                bundle = response.json()
+            
+            mitre_index = MitreAttackIndex.from_bundle(bundle, self.mitre_base)
+            if index_path and mitre_index.groups:
+                stored = {'source': source, 'built_at': time.time(), 'groups': mitre_index.groups}
+                write_file_atomic(index_path, json.dumps(stored, ensure_ascii=False).encode('utf-8'))
+            
+            return mitre_index if mitre_index.groups else None
+        except Exception as error:
+            self.record_error(error)
+            return None
 
     def get_mitre_group_details(self, group_id):
+        try:
+            mitre_index = self.fetch_shared('mitre_index', self.load_mitre_index)
+            if mitre_index and group_id in mitre_index.groups:
+                group = mitre_index.copy_group(group_id)
+                return {'url': group['url'], 'techniques': group['techniques']}
+            return self.scrape_mitre_group_details(group_id)
+        except Exception as error:
+            self.record_error(error)
+            return None
+
+    def scrape_mitre_group_details(self, group_id):
         try:
             group_url = f"{self.mitre_base}/groups/{group_id}/"
             response = self.session.get(group_url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content, only='table')
             techniques = []
             tables = soup.find_all('table')
             
@@ -405,7 +1994,8 @@ class APTSearcher:
                 'url': group_url,
                 'techniques': techniques
             }
-        except:
+        except Exception as error:
+            self.record_error(error)
             return None
 
     def save_mitre_navigator_file(self, apt_name, mitre_data):
@@ -413,32 +2003,12 @@ class APTSearcher:
             return None
             
         try:
-            navigator_data = {
-                "name": f"{apt_name} - MITRE ATT&CK Techniques",
-                "description": f"Techniques used by {apt_name} according to MITRE ATT&CK",
-                "domain": "enterprise-attack",
-                "version": "4.5",
-                "techniques": []
-            }
-            
-            all_techniques = []
-            for group in mitre_data:
-                all_techniques.extend(group.get('techniques', []))
-            
-            for tech in all_techniques:
-                navigator_data["techniques"].append({
-                    "techniqueID": tech['id'],
-                    "color": "#ff6666",
-                    "score": 1,
-                    "comment": tech['use']
-                })
+            navigator_data = build_navigator_layer(f"{apt_name} - MITRE ATT&CK Techniques", f"Techniques used by {apt_name} according to MITRE ATT&CK", mitre_data)
+            layer_path = navigator_filename(apt_name)
+            write_file_atomic(layer_path, json.dumps(navigator_data, indent=2, ensure_ascii=False).encode('utf-8'))
             
-            navigator_filename = f"{apt_name.replace(' ', '_')}_MITRE_Navigator.json"
-            with open(navigator_filename, 'w', encoding='utf-8') as f:
-                json.dump(navigator_data, f, indent=2, ensure_ascii=False)
-            
-            report_filename = f"{apt_name.replace(' ', '_')}_MITRE_Techniques_Report.txt"
-            with open(report_filename, 'w', encoding='utf-8') as f:
+            report_path = report_filename(apt_name)
+            with open(report_path, 'w', encoding='utf-8') as f:
                 f.write(f"MITRE ATT&CK Analysis Report\n")
                 f.write(f"=" * 50 + "\n\n")
                 f.write(f"APT Group: {apt_name}\n")
@@ -464,26 +2034,119 @@ class APTSearcher:
                     else:
                         f.write("No techniques found for this group.\n\n")
             
-            return navigator_filename, report_filename
-        except:
+            return layer_path, report_path
+        except Exception as error:
+            self.record_error(error)
             return None
 
+    def match_mitre_ids(self, apt_name, mitre_index):
+        group_id = mitre_index.aliases.get(apt_name.strip().lower())
+        if group_id:
+            return [group_id]
+        
+        alias_graph = self.alias_graph
+        actor = alias_graph.resolve(apt_name) if alias_graph else None
+        if actor and actor['mitre']:
+            return [group_id for group_id in actor['mitre'] if group_id in mitre_index.groups]
+        return mitre_index.match_ids(apt_name)
+
+    def export_navigator_layers(self, output_dir, names=None):
+        mitre_index = self.fetch_shared('mitre_index', self.load_mitre_index)
+        if not mitre_index:
+            return None
+        
+        layers = []
+        missing = []
+        taken = set()
+        if names is None:
+            for group_id, group in sorted(mitre_index.groups.items()):
+                layers.append((f"{group_id} {group['name']}", [group_id], build_navigator_layer(
+                    f"{group['name']} ({group_id}) - MITRE ATT&CK Techniques",
+                    f"Techniques used by {group['name']} according to MITRE ATT&CK",
+                    [group]
+                )))
+        else:
+            watched = {}
+            taken.add(file_stem('watchlist').lower())
+            for apt_name in dict.fromkeys(names):
+                group_ids = self.match_mitre_ids(apt_name, mitre_index)
+                if not group_ids:
+                    missing.append(apt_name)
+                    continue
+                
+                groups = [mitre_index.groups[group_id] for group_id in group_ids]
+                watched.update(zip(group_ids, groups))
+                layers.append((apt_name, group_ids, build_navigator_layer(
+                    f"{apt_name} - MITRE ATT&CK Techniques",
+                    f"Techniques used by {apt_name} according to MITRE ATT&CK",
+                    groups
+                )))
+            
+            if watched:
+                layers.append(('watchlist', None, build_navigator_layer(
+                    "Watchlist - MITRE ATT&CK Techniques",
+                    f"Techniques used by {len(watched)} watched groups; the score is the number of groups using each technique",
+                    [watched[group_id] for group_id in sorted(watched)]
+                )))
+        
+        paths = []
+        for name, group_ids, layer in layers:
+            stem = file_stem(name)
+            if group_ids is not None:
+                if stem.lower() in taken:
+                    stem = file_stem(f"{name} {' '.join(group_ids)}")
+                base, counter = stem, 2
+                while stem.lower() in taken:
+                    stem = f"{base}_{counter}"
+                    counter += 1
+                taken.add(stem.lower())
+            path = os.path.join(output_dir, navigator_filename(stem))
+            write_file_atomic(path, json.dumps(layer, indent=2, ensure_ascii=False).encode('utf-8'))
+            paths.append(path)
+        
+        return {'layers': paths, 'groups': len(mitre_index.groups), 'missing': missing}
+
     def get_current_date(self):
         from datetime import datetime
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    def load_aptnotes_data(self):
+    def load_aptnotes_index(self):
         try:
-            print(f"{CYAN}Loading APTnotes database...{ENDC}")
+            self.log(f"{CYAN}Loading APTnotes database...{ENDC}")
             response = self.session.get(self.aptnotes_url)
             response.raise_for_status()
-            return json.loads(response.text)
-        except:
-            return []
+            aptnotes_data = json.loads(response.text)
+            fingerprint = hashlib.sha1(response.content).hexdigest()
+            index_path = os.path.join(self.cache_dir, 'aptnotes_index.json') if self.cache_dir else None
+            
+            if index_path and os.path.exists(index_path):
+                try:
+                    with open(index_path, 'r', encoding='utf-8') as f:
+                        stored = json.load(f)
+                    if stored.get('fingerprint') == fingerprint:
+                        return APTnotesIndex.from_dict(stored, aptnotes_data)
+                except (OSError, ValueError, KeyError):
+                    pass
+            
+            aptnotes_index = APTnotesIndex(aptnotes_data, fingerprint=fingerprint)
+            if index_path:
+                write_file_atomic(index_path, json.dumps(aptnotes_index.to_dict()).encode('utf-8'))
+            return aptnotes_index
+        except Exception as error:
+            self.record_error(error)
+            return None
 
     def search_malpedia(self, apt_name):
         try:
-            print(f"{CYAN}Searching Malpedia database...{ENDC}")
+            self.log(f"{CYAN}Searching Malpedia database...{ENDC}")
+            
+            malpedia_catalogue = self.fetch_shared('malpedia_catalogue', self.load_malpedia_catalogue)
+            if malpedia_catalogue:
+                slug = malpedia_catalogue.resolve(apt_name)
+                if slug:
+                    actor_data = self.fetch_malpedia_actor(slug)
+                    return [actor_data] if actor_data else []
+                return self.search_malpedia_library(apt_name)
             
             search_variations = [
                 apt_name.lower().replace(" ", "_"),
@@ -499,12 +2162,13 @@ class APTSearcher:
                 try:
                     response = self.session.get(actor_url)
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
+                        soup = self.parse_html(response.content)
                         actor_data = self.extract_malpedia_actor_info(soup, actor_url)
                         if actor_data:
                             malpedia_data.append(actor_data)
                             break
-                except:
+                except Exception as error:
+                    self.record_error(error)
                     continue
                 
                 library_url = f"{self.malpedia_base}/library"
@@ -512,18 +2176,95 @@ class APTSearcher:
                 try:
                     response = self.session.get(library_url, params=search_params)
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
+                        soup = self.parse_html(response.content, only='table')
                         library_data = self.extract_malpedia_library_info(soup, apt_name)
                         if library_data:
                             malpedia_data.extend(library_data)
                             break
-                except:
+                except Exception as error:
+                    self.record_error(error)
                     continue
             
             return malpedia_data
-        except:
+        except Exception as error:
+            self.record_error(error)
             return []
 
+    def fetch_malpedia_actor(self, slug):
+        actor_url = f"{self.malpedia_base}/actor/{slug}"
+        response = self.session.get(actor_url)
+        if response.status_code == 200:
+            soup = self.parse_html(response.content)
+            return self.extract_malpedia_actor_info(soup, actor_url)
+        return None
+
+    def search_malpedia_library(self, apt_name):
+        library_url = f"{self.malpedia_base}/library"
+        search_params = {'search': apt_name}
+        response = self.session.get(library_url, params=search_params)
+        if response.status_code == 200:
+            soup = self.parse_html(response.content, only='table')
+            return self.extract_malpedia_library_info(soup, apt_name)
+        return []
+
+    def load_malpedia_catalogue(self):
+        catalogue_path = os.path.join(self.cache_dir, 'malpedia_catalogue.json') if self.cache_dir else None
+        malpedia_catalogue = MalpediaCatalogue()
+        if catalogue_path and os.path.exists(catalogue_path):
+            try:
+                with open(catalogue_path, 'r', encoding='utf-8') as f:
+                    malpedia_catalogue = MalpediaCatalogue.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        ttl = self.cache_ttls.get('malpedia', DEFAULT_CACHE_TTL)
+        if malpedia_catalogue.actors and time.time() - malpedia_catalogue.listed_at < ttl:
+            return malpedia_catalogue
+        
+        try:
+            self.log(f"{CYAN}Refreshing Malpedia actor listing...{ENDC}")
+            response = self.session.get(f"{self.malpedia_base}/api/list/actors")
+            response.raise_for_status()
+            malpedia_catalogue.update_listing(response.json())
+            if catalogue_path:
+                write_file_atomic(catalogue_path, json.dumps(malpedia_catalogue.to_dict(), ensure_ascii=False).encode('utf-8'))
+        except Exception as error:
+            self.record_error(error)
+        
+        return malpedia_catalogue if malpedia_catalogue.actors else None
+
+    def sync_malpedia(self):
+        if not self.cache_dir:
+            raise ValueError("the Malpedia catalogue needs a cache directory")
+        
+        self.log(f"{CYAN}Syncing Malpedia actor details...{ENDC}")
+        self.clear_shared('malpedia_catalogue')
+        malpedia_catalogue = self.fetch_shared('malpedia_catalogue', self.load_malpedia_catalogue)
+        if not malpedia_catalogue:
+            raise requests.ConnectionError("the Malpedia actor listing is unavailable")
+        
+        refresh_slugs = malpedia_catalogue.refresh_slugs(MALPEDIA_DETAIL_MAX_AGE)
+        stats = {'actors': len(malpedia_catalogue.actors), 'updated': 0, 'failed': 0}
+        
+        def fetch_details(slug):
+            with self.malpedia_sync_semaphore:
+                detail_response = self.session.get(f"{self.malpedia_base}/api/get/actor/{slug}")
+                detail_response.raise_for_status()
+                return detail_response.json()
+        
+        futures = {self.submit_probe(fetch_details, slug): slug for slug in refresh_slugs}
+        for future in as_completed(futures):
+            try:
+                malpedia_catalogue.update_actor(futures[future], future.result())
+                stats['updated'] += 1
+            except Exception as error:
+                self.record_error(error)
+                stats['failed'] += 1
+        
+        catalogue_path = os.path.join(self.cache_dir, 'malpedia_catalogue.json')
+        write_file_atomic(catalogue_path, json.dumps(malpedia_catalogue.to_dict(), ensure_ascii=False).encode('utf-8'))
+        return stats
+
     def extract_malpedia_actor_info(self, soup, url):
         try:
             actor_info = {
@@ -568,7 +2309,8 @@ class APTSearcher:
                             })
             
             return actor_info if actor_info['resources'] else None
-        except:
+        except Exception as error:
+            self.record_error(error)
             return None
 
     def extract_malpedia_library_info(self, soup, apt_name):
@@ -609,32 +2351,13 @@ class APTSearcher:
                                 library_data.append(resource_info)
             
             return library_data
-        except:
+        except Exception as error:
+            self.record_error(error)
             return []
 
-    def search_aptnotes(self, apt_name, aptnotes_data):
-        matches = []
-        search_terms = [
-            apt_name.lower(),
-            apt_name.replace(" ", "").lower(),
-            apt_name.replace(" ", "_").lower(),
-            apt_name.replace("apt", "").strip().lower(),
-        ]
-        
-        for entry in aptnotes_data:
-            title = entry.get("Title", "").lower()
-            filename = entry.get("Filename", "").lower()
-            
-            for term in search_terms:
-                if term in title or term in filename or any(word in title for word in term.split()) or any(word in filename for word in term.split()):
-                    matches.append(entry)
-                    break
-                    
-        return matches
-
     def search_apt_etda(self, apt_name):
         try:
-            print(f"{CYAN}Searching ETDA database...{ENDC}")
+            self.log(f"{CYAN}Searching ETDA database...{ENDC}")
             
             search_params = {
                 'c': '',
@@ -646,102 +2369,52 @@ class APTSearcher:
             
             response = self.session.get(self.listgroups_url, params=search_params)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content, only=['table', 'a'])
             apt_groups = self.extract_apt_groups_from_list(soup, apt_name)
             
             if apt_groups:
-                print(f"{GREEN}Found {len(apt_groups)} ETDA result(s){ENDC}")
+                self.log(f"{GREEN}Found {len(apt_groups)} ETDA result(s){ENDC}")
                 return [apt_groups[0]['url']]
             else:
-                print(f"{RED}No ETDA results found{ENDC}")
+                self.log(f"{RED}No ETDA results found{ENDC}")
                 return []
-        except:
+        except Exception as error:
+            self.record_error(error)
             return []
 
     def extract_apt_groups_from_list(self, soup, apt_name):
-        apt_groups = []
-        
         try:
-            tables = soup.find_all('table')
+            candidates = {}
+            links = [link for table in soup.find_all('table') for link in table.find_all('a', href=True)] or soup.find_all('a', href=True)
             
-            for table in tables:
-                rows = table.find_all('tr')
-                
-                for row in rows:
-                    links = row.find_all('a', href=True)
-                    
-                    for link in links:
-                        href = link.get('href')
-                        link_text = link.get_text(strip=True)
-                        
-                        if 'showcard.cgi' in href:
-                            relevance_score = self.calculate_relevance(link_text, apt_name)
-                            
-                            if relevance_score > 0:
-                                full_url = urljoin(self.base_url, href)
-                                apt_groups.append({
-                                    'name': link_text,
-                                    'url': full_url,
-                                    'relevance': relevance_score
-                                })
-            
-            if not apt_groups:
-                all_links = soup.find_all('a', href=True)
-                for link in all_links:
-                    href = link.get('href')
-                    link_text = link.get_text(strip=True)
-                    
-                    if 'showcard.cgi' in href and link_text:
-                        relevance_score = self.calculate_relevance(link_text, apt_name)
-                        if relevance_score > 0:
-                            full_url = urljoin(self.base_url, href)
-                            apt_groups.append({
-                                'name': link_text,
-                                'url': full_url,
-                                'relevance': relevance_score
-                            })
+            for link in links:
+                href = link.get('href')
+                link_text = link.get_text(strip=True)
+                if 'showcard.cgi' in href and link_text:
+                    candidates.setdefault(urljoin(self.listgroups_url, href), link_text)
             
-            apt_groups.sort(key=lambda x: x['relevance'], reverse=True)
-            return apt_groups
-        except:
+            matcher = NameMatcher((url, [link_text] + split_etda_names(link_text)) for url, link_text in candidates.items())
+            return [{
+                'name': candidates[url],
+                'url': url,
+                'relevance': round(score * 100)
+            } for url, score, name in matcher.top(apt_name, None)]
+        except Exception as error:
+            self.record_error(error)
             return []
 
-    def calculate_relevance(self, link_text, search_term):
-        if not link_text or not search_term:
-            return 0
-        
-        link_lower = link_text.lower()
-        search_lower = search_term.lower()
-        score = 0
-        
-        if search_lower == link_lower:
-            score += 100
-        elif search_lower in link_lower:
-            score += 50
-        
-        search_words = search_lower.split()
-        link_words = link_lower.split()
-        
-        for search_word in search_words:
-            for link_word in link_words:
-                if search_word == link_word:
-                    score += 20
-                elif search_word in link_word or link_word in search_word:
-                    score += 10
-        
-        if 'apt' in search_lower and 'apt' in link_lower:
-            score += 5
-        
-        if 'group' in search_lower and 'group' in link_lower:
-            score += 5
-            
-        return score
-
     def extract_apt_info_etda(self, apt_url):
         try:
             response = self.session.get(apt_url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            return self.parse_etda_card(response.content, apt_url)
+        except Exception as error:
+            self.record_error(error)
+            return None
+
+    def parse_etda_card(self, content, apt_url):
+        try:
+            soup = self.parse_html(content)
             
             apt_data = {
                 'name': 'Not found',
@@ -776,9 +2449,80 @@ class APTSearcher:
             apt_data['additional_links'] = self.extract_etda_links(soup)
             
             return apt_data
-        except:
+        except Exception as error:
+            self.record_error(error)
             return None
 
+    def get_etda_store(self):
+        if not self.cache_dir or not os.path.exists(os.path.join(self.cache_dir, ETDA_STORE_NAME)):
+            return None
+        etda_store = self.fetch_shared('etda_store', lambda: EtdaStore(os.path.join(self.cache_dir, ETDA_STORE_NAME)), expires=False)
+        return etda_store if etda_store.count() else None
+
+    def list_etda_cards(self):
+        response = self.session.get(self.listgroups_url)
+        response.raise_for_status()
+        soup = self.parse_html(response.content, only='a')
+        
+        cards = {}
+        for link in soup.find_all('a', href=True):
+            href = link.get('href')
+            link_text = link.get_text(strip=True)
+            if 'showcard.cgi' in href and link_text:
+                cards.setdefault(urljoin(self.listgroups_url, href), link_text)
+        return cards
+
+    def sync_etda(self):
+        if not self.cache_dir:
+            raise ValueError("the ETDA mirror needs a cache directory")
+        
+        self.log(f"{CYAN}Syncing ETDA group cards...{ENDC}")
+        etda_store = self.fetch_shared('etda_store', lambda: EtdaStore(os.path.join(self.cache_dir, ETDA_STORE_NAME)), expires=False)
+        stored_count = etda_store.count()
+        cards = self.list_etda_cards()
+        stats = {'new': 0, 'updated': 0, 'unchanged': 0, 'failed': 0, 'removed': 0, 'removal_skipped': False}
+        limit = threading.BoundedSemaphore(self.link_check_limit)
+        
+        def sync_card(url):
+            with limit:
+                validators = etda_store.validators(url)
+                headers = {}
+                if validators and validators['etag']:
+                    headers['If-None-Match'] = validators['etag']
+                if validators and validators['last_modified']:
+                    headers['If-Modified-Since'] = validators['last_modified']
+                response = self.session.get(url, headers=headers)
+            
+            if response.status_code == 304:
+                etda_store.touch(url)
+                return 'unchanged'
+            response.raise_for_status()
+            
+            content_hash = hashlib.sha1(response.content).hexdigest()
+            if validators and validators['content_hash'] == content_hash:
+                etda_store.touch(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                return 'unchanged'
+            
+            apt_data = self.parse_etda_card(response.content, url)
+            if not apt_data:
+                return 'failed'
+            etda_store.upsert(url, cards[url], apt_data, response.headers.get('ETag'), response.headers.get('Last-Modified'), content_hash)
+            return 'updated' if validators else 'new'
+        
+        futures = [self.submit_probe(sync_card, url) for url in cards]
+        for future in as_completed(futures):
+            try:
+                stats[future.result()] += 1
+            except Exception as error:
+                self.record_error(error)
+                stats['failed'] += 1
+        
+        if cards and not stats['failed'] and len(cards) >= stored_count * ETDA_MIN_LISTING_RATIO:
+            stats['removed'] = etda_store.remove_missing(cards)
+        else:
+            stats['removal_skipped'] = True
+        return stats
+
     def is_apt_info_table(self, table):
         table_text = table.get_text().lower()
         indicators = ['names', 'country', 'motivation', 'first seen', 'description', 'observed sectors']
@@ -819,7 +2563,8 @@ class APTSearcher:
                         apt_data['tools_used'] = self.extract_list_items(value_cell)
                     elif 'information' in field_name or 'details' in field_name:
                         apt_data['information'] = self.extract_clean_text(value_cell)
-        except:
+        except Exception as error:
+            self.record_error(error)
             pass
 
     def parse_etda_fallback(self, soup, apt_data):
@@ -850,7 +2595,8 @@ class APTSearcher:
                             apt_data['first_seen'] = value
                         elif field == 'description':
                             apt_data['description'] = value
-        except:
+        except Exception as error:
+            self.record_error(error)
             pass
 
     def extract_clean_text(self, cell):
@@ -864,7 +2610,8 @@ class APTSearcher:
             text = text.strip()
             
             return text if text else 'Not found'
-        except:
+        except Exception as error:
+            self.record_error(error)
             return 'Not found'
 
     def extract_list_items(self, cell):
@@ -915,7 +2662,8 @@ class APTSearcher:
                     cleaned_items.append(item)
             
             return cleaned_items
-        except:
+        except Exception as error:
+            self.record_error(error)
             return []
 
     def extract_etda_operations(self, soup):
@@ -931,7 +2679,8 @@ class APTSearcher:
                     operations.append(line)
             
             return operations[:5]
-        except:
+        except Exception as error:
+            self.record_error(error)
             return []
 
     def extract_etda_links(self, soup):
@@ -957,9 +2706,29 @@ class APTSearcher:
                     unique_links.append(link)
             
             return unique_links[:10]
-        except:
+        except Exception as error:
+            self.record_error(error)
             return []
 
+    def format_source_output(self, source, data, saved_files=None):
+        if source == 'etda':
+            return self.format_etda_output(data)
+        if source == 'mitre':
+            return self.format_mitre_output(data, saved_files or [])
+        if source == 'google_cloud':
+            return self.format_google_cloud_output(data)
+        if source == 'netenrich':
+            return self.format_netenrich_output(data)
+        if source == 'socradar':
+            return self.format_socradar_output(data)
+        if source == 'pulsedive':
+            return self.format_pulsedive_output(data)
+        if source == 'qianxin':
+            return self.format_qianxin_output(data)
+        if source == 'malpedia':
+            return self.format_malpedia_output(data)
+        return self.format_aptnotes_output(data)
+
     def format_etda_output(self, apt_data):
         if not apt_data:
             return ""
@@ -1121,7 +2890,9 @@ class APTSearcher:
             techniques = group.get('techniques', [])
             total_techniques += len(techniques)
             
-            if techniques:
+            if group.get('details_pending'):
+                output.append("\n   Techniques not loaded; raise --mitre-details to include this group.")
+            elif techniques:
                 output.append(f"\nTechniques Used ({len(techniques)} total):")
                 
                 domains = {}
@@ -1149,7 +2920,10 @@ class APTSearcher:
                 if filename:
                     output.append(f"   {filename}")
         
+        pending_groups = sum(1 for group in mitre_data if group.get('details_pending'))
         output.append(f"\nMITRE Summary: {len(mitre_data)} group(s) found with {total_techniques} total techniques")
+        if pending_groups:
+            output.append(f"{pending_groups} group(s) listed without details")
         
         return "\n".join(output)
 
@@ -1263,151 +3037,561 @@ class APTSearcher:
         
         return "\n".join(output)
 
-    def search_comprehensive(self, apt_name):
-        print(f"\n{CYAN}Comprehensive APT Search for: {apt_name}{ENDC}")
-        print(f"{BEBEBLUE}{'='*50}{ENDC}")
+    def load_alias_graph(self):
+        with self.shared_lock:
+            inputs = tuple(self.shared_data.get(key) for key in self.alias_graph_keys)
+        if inputs == self.alias_graph_inputs:
+            return self.alias_graph
+        
+        with self.alias_graph_lock:
+            if inputs != self.alias_graph_inputs:
+                mitre_index, etda_store, malpedia_catalogue = inputs
+                etda_entries = etda_store.load_entries() if etda_store else []
+                self.alias_graph = AliasGraph.build(mitre_index, etda_entries, malpedia_catalogue) if mitre_index or etda_entries or malpedia_catalogue else None
+                self.alias_graph_inputs = inputs
+            return self.alias_graph
+
+    def resolve_alias(self, apt_name):
+        alias_graph = self.load_alias_graph()
+        return alias_graph.resolve(apt_name, fuzzy=False) if alias_graph else None
+
+    def collect_mitre(self, apt_name):
+        mitre_index = self.fetch_shared('mitre_index', self.load_mitre_index)
+        actor = self.resolve_alias(apt_name)
+        if actor and actor['mitre'] and mitre_index:
+            self.log(f"{CYAN}Searching MITRE ATT&CK database for {', '.join(actor['mitre'])}...{ENDC}")
+            return [mitre_index.copy_group(group_id) for group_id in actor['mitre'] if group_id in mitre_index.groups]
+        return self.search_mitre_attack(apt_name)
+
+    def collect_malpedia(self, apt_name):
+        self.fetch_shared('malpedia_catalogue', self.load_malpedia_catalogue)
+        actor = self.resolve_alias(apt_name)
+        if actor and actor['malpedia']:
+            self.log(f"{CYAN}Searching Malpedia database for {actor['malpedia'][0]}...{ENDC}")
+            try:
+                actor_data = self.fetch_malpedia_actor(actor['malpedia'][0])
+                return [actor_data] if actor_data else []
+            except Exception as error:
+                self.record_error(error)
+                return []
+        return self.search_malpedia(apt_name)
+
+    def collect_etda(self, apt_name):
+        etda_store = self.get_etda_store()
+        actor = self.resolve_alias(apt_name)
+        if actor and actor['etda']:
+            if etda_store:
+                return etda_store.get(actor['etda'][0])
+            self.log(f"{CYAN}Fetching ETDA card for {actor['canonical']}...{ENDC}")
+            return self.extract_apt_info_etda(actor['etda'][0])
+        
+        if etda_store:
+            self.log(f"{CYAN}Searching ETDA mirror...{ENDC}")
+            return etda_store.find(apt_name)
         
-        print(f"{CYAN}Searching ETDA database...{ENDC}")
         etda_links = self.search_apt_etda(apt_name)
-        etda_data = None
-        
         if etda_links:
-            print(f"{GREEN}Found ETDA result{ENDC}")
-            etda_data = self.extract_apt_info_etda(etda_links[0])
+            return self.extract_apt_info_etda(etda_links[0])
+        return None
+
+    def collect_aptnotes(self, apt_name):
+        self.log(f"{CYAN}Searching APTnotes database...{ENDC}")
+        aptnotes_index = self.fetch_shared('aptnotes_index', self.load_aptnotes_index)
+        if aptnotes_index:
+            return aptnotes_index.search(apt_name)
+        return []
+
+    def get_source_tasks(self):
+        return {source: getattr(self, SOURCE_PLUGINS[source].collect) for source in self.sources}
+
+    def empty_result(self, source):
+        if SOURCE_PLUGINS[source].single:
+            return None
+        return []
+
+    def announce_result(self, source, data):
+        if not data:
+            return
+        
+        if source == 'etda':
+            self.log(f"{GREEN}Found ETDA result{ENDC}")
+        elif source == 'mitre':
+            techniques_count = sum(len(group.get('techniques', [])) for group in data)
+            self.log(f"{GREEN}Found MITRE ATT&CK data with {techniques_count} techniques{ENDC}")
+        elif source == 'google_cloud':
+            self.log(f"{GREEN}Found {len(data)} Google Cloud APT profiles{ENDC}")
+        elif source == 'netenrich':
+            self.log(f"{GREEN}Found {len(data)} NetEnrich resources{ENDC}")
+        elif source == 'socradar':
+            self.log(f"{GREEN}Found {len(data)} SOCRadar articles{ENDC}")
+        elif source == 'pulsedive':
+            self.log(f"{GREEN}Found Pulsedive threat intelligence{ENDC}")
+        elif source == 'qianxin':
+            self.log(f"{GREEN}Found {len(data)} QiAnXin link(s){ENDC}")
+        elif source == 'malpedia':
+            total_resources = sum(len(item.get('resources', [])) for item in data)
+            self.log(f"{GREEN}Found Malpedia data with {total_resources} resources{ENDC}")
+        elif source == 'aptnotes':
+            self.log(f"{GREEN}Found {len(data)} APTnotes reports{ENDC}")
+
+    def run_source_task(self, source, task, apt_name):
+        trace_context.source = source
+        start = time.perf_counter()
+        data = None
+        try:
+            data = task(apt_name)
+            return data
+        finally:
+            self.scheduler.record(source, query_shape(apt_name), time.perf_counter() - start, bool(data))
+            if self.tracer:
+                self.tracer.record('source', apt_name=apt_name, wall_ms=(time.perf_counter() - start) * 1000)
+            trace_context.source = None
+
+    def iter_sources(self, apt_name, deadline=None, statuses=None):
+        if deadline is None:
+            deadline = self.deadline
+        if statuses is None:
+            statuses = {}
+        
+        tasks = self.get_source_tasks()
+        ordered, pruned = self.scheduler.plan(list(tasks), apt_name, deadline)
+        busy = []
+        if deadline is not None:
+            with self.abandoned_lock:
+                busy = [source for source in ordered if self.abandoned.get(source)]
+        futures = {self.executor.submit(self.run_source_task, source, tasks[source], apt_name): source for source in ordered if source not in busy}
+        pending = set(futures)
+        
+        try:
+            for source in pruned:
+                statuses[source] = 'pruned'
+                self.log(f"{YELLOW}Skipping {SOURCE_LABELS[source]}: unlikely to answer within the deadline{ENDC}")
+                yield source, self.empty_result(source)
+            
+            for source in busy:
+                statuses[source] = 'busy'
+                self.log(f"{YELLOW}Skipping {SOURCE_LABELS[source]}: an earlier late request is still running{ENDC}")
+                yield source, self.empty_result(source)
+            
+            try:
+                for future in as_completed(futures, timeout=deadline):
+                    pending.discard(future)
+                    source = futures[future]
+                    try:
+                        data = future.result()
+                        statuses[source] = 'found' if data else 'not_found'
+                    except Exception as error:
+                        self.record_error(error, source)
+                        data = self.empty_result(source)
+                        statuses[source] = 'error'
+                    self.announce_result(source, data)
+                    yield source, data
+            except FutureTimeoutError:
+                for future in futures:
+                    if future in pending:
+                        source = futures[future]
+                        statuses[source] = 'timed_out'
+                        if not future.cancel():
+                            self.abandon(source, future)
+                        if self.tracer:
+                            self.tracer.record('timeout', source=source, apt_name=apt_name, deadline=deadline)
+                        self.log(f"{YELLOW}{SOURCE_LABELS[source]} missed the {deadline:g}s deadline{ENDC}")
+                        yield source, self.empty_result(source)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def abandon(self, source, future):
+        with self.abandoned_lock:
+            self.abandoned[source] = self.abandoned.get(source, 0) + 1
         
-        mitre_data = self.search_mitre_attack(apt_name)
+        def release(future):
+            with self.abandoned_lock:
+                self.abandoned[source] -= 1
+        
+        future.add_done_callback(release)
+
+    def run_sources(self, apt_name, deadline=None, statuses=None):
+        return dict(self.iter_sources(apt_name, deadline, statuses))
+
+    def search_comprehensive(self, apt_name, save_files=True, deadline=None):
+        self.log(f"\n{CYAN}Comprehensive APT Search for: {apt_name}{ENDC}")
+        self.log(f"{BEBEBLUE}{'='*50}{ENDC}")
+        
+        statuses = {source: 'skipped' for source in SOURCE_ORDER}
+        results = self.run_sources(apt_name, deadline, statuses)
+        self.scheduler.save()
+        etda_data, mitre_data, google_cloud_data, netenrich_links, socradar_articles, pulsedive_url, qianxin_links, malpedia_data, aptnotes_matches = [results[source] if source in results else self.empty_result(source) for source in SOURCE_ORDER]
         saved_files = []
         
-        if mitre_data:
-            techniques_count = sum(len(group.get('techniques', [])) for group in mitre_data)
-            print(f"{GREEN}Found MITRE ATT&CK data with {techniques_count} techniques{ENDC}")
-            
+        if mitre_data and save_files:
             files = self.save_mitre_navigator_file(apt_name, mitre_data)
             if files:
                 saved_files.extend(files)
-                print(f"{GREEN}Saved MITRE files to device: {', '.join(files)}{ENDC}")
-        
-        google_cloud_data = self.search_google_cloud_apt(apt_name)
-        if google_cloud_data:
-            print(f"{GREEN}Found {len(google_cloud_data)} Google Cloud APT profiles{ENDC}")
-        
-        netenrich_links = self.search_netenrich(apt_name)
-        if netenrich_links:
-            print(f"{GREEN}Found {len(netenrich_links)} NetEnrich resources{ENDC}")
-        
-        socradar_articles = self.search_socradar(apt_name)
-        if socradar_articles:
-            print(f"{GREEN}Found {len(socradar_articles)} SOCRadar articles{ENDC}")
+                self.log(f"{GREEN}Saved MITRE files to device: {', '.join(files)}{ENDC}")
         
-        pulsedive_url = self.search_pulsedive(apt_name)
-        if pulsedive_url:
-            print(f"{GREEN}Found Pulsedive threat intelligence{ENDC}")
-        
-        qianxin_links = self.search_qianxin(apt_name)
-        if qianxin_links:
-            print(f"{GREEN}Found {len(qianxin_links)} QiAnXin link(s){ENDC}")
-        
-        malpedia_data = self.search_malpedia(apt_name)
-        if malpedia_data:
-            total_resources = sum(len(item.get('resources', [])) for item in malpedia_data)
-            print(f"{GREEN}Found Malpedia data with {total_resources} resources{ENDC}")
-        
-        print(f"{CYAN}Searching APTnotes database...{ENDC}")
-        aptnotes_data = self.load_aptnotes_data()
-        aptnotes_matches = []
-        
-        if aptnotes_data:
-            aptnotes_matches = self.search_aptnotes(apt_name, aptnotes_data)
-            if aptnotes_matches:
-                print(f"{GREEN}Found {len(aptnotes_matches)} APTnotes reports{ENDC}")
-        
-        return etda_data, mitre_data, google_cloud_data, netenrich_links, socradar_articles, pulsedive_url, qianxin_links, malpedia_data, aptnotes_matches, saved_files
+        return SearchResults((etda_data, mitre_data, google_cloud_data, netenrich_links, socradar_articles, pulsedive_url, qianxin_links, malpedia_data, aptnotes_matches, saved_files), statuses)
 
-def main():
-    display_banner()
+def count_resources(results):
+    etda_data, mitre_data, google_cloud_data, netenrich_links, socradar_articles, pulsedive_url, qianxin_links, malpedia_data, aptnotes_matches, saved_files = results
     
-    searcher = APTSearcher()
+    total_resources = 0
+    if etda_data:
+        total_resources += len(etda_data.get('additional_links', []))
+    if mitre_data:
+        total_resources += sum(len(group.get('techniques', [])) for group in mitre_data)
+    if google_cloud_data:
+        total_resources += len(google_cloud_data)
+    if netenrich_links:
+        total_resources += len(netenrich_links)
+    if socradar_articles:
+        total_resources += len(socradar_articles)
+    if pulsedive_url:
+        total_resources += 1
+    if qianxin_links:
+        total_resources += len(qianxin_links)
+    if malpedia_data:
+        total_resources += sum(len(item.get('resources', [])) for item in malpedia_data)
+    total_resources += len(aptnotes_matches)
     
-    apt_name = input(f"{WHITE}Enter APT group name to search: {ENDC}").strip()
+    return total_resources
+
+def build_result_document(apt_name, results, queried=None):
+    saved_files = results[len(SOURCE_ORDER)]
+    sources = dict(zip(SOURCE_ORDER, results[:len(SOURCE_ORDER)]))
+    queried = list(queried or SOURCE_ORDER)
+    statuses = getattr(results, 'statuses', None) or {source: ('found' if sources[source] else 'not_found') if source in queried else 'skipped' for source in SOURCE_ORDER}
     
-    if not apt_name:
-        print(f"{RED}Please enter a valid APT name.{ENDC}")
+    return {
+        'schema_version': RESULT_SCHEMA_VERSION,
+        'query': apt_name,
+        'queried': queried,
+        'complete': not INCOMPLETE_STATUSES.intersection(statuses.values()),
+        'status': dict(statuses),
+        'sources': sources,
+        'found': [source for source in SOURCE_ORDER if sources[source]],
+        'total_resources': count_resources(results),
+        'saved_files': saved_files
+    }
+
+def dump_json(document, indent=None):
+    return json.dumps(document, ensure_ascii=False, indent=indent, default=str)
+
+def print_document(document, output_format):
+    if output_format == 'ndjson' and isinstance(document, list):
+        for record in document:
+            print(dump_json(record))
+        return
+    print(dump_json(document, indent=2 if output_format == 'json' else None))
+
+def read_batch_names(path):
+    if path == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    
+    names = []
+    seen = set()
+    for line in lines:
+        name = line.strip()
+        if name and not name.startswith('#') and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+def run_batch(searcher, names, workers, output_format='text'):
+    if output_format != 'text':
+        run_batch_export(searcher, names, workers, output_format)
         return
     
-    etda_data, mitre_data, google_cloud_data, netenrich_links, socradar_articles, pulsedive_url, qianxin_links, malpedia_data, aptnotes_matches, saved_files = searcher.search_comprehensive(apt_name)
+    print(f"{CYAN}Batch search for {len(names)} APT names with {workers} workers{ENDC}")
+    start_time = time.time()
+    completed = 0
     
-    if etda_data or mitre_data or google_cloud_data or netenrich_links or socradar_articles or pulsedive_url or qianxin_links or malpedia_data or aptnotes_matches:
-        print(f"\n{VIOLET}{BOLD}SEARCH RESULTS{ENDC}\n")
-        
-        if etda_data:
-            etda_output = searcher.format_etda_output(etda_data)
-            print(etda_output)
-        
-        if mitre_data:
-            mitre_output = searcher.format_mitre_output(mitre_data, saved_files)
-            print(mitre_output)
-        
-        if google_cloud_data:
-            google_cloud_output = searcher.format_google_cloud_output(google_cloud_data)
-            print(google_cloud_output)
-        
-        if netenrich_links:
-            netenrich_output = searcher.format_netenrich_output(netenrich_links)
-            print(netenrich_output)
-        
-        if socradar_articles:
-            socradar_output = searcher.format_socradar_output(socradar_articles)
-            print(socradar_output)
-        
-        if pulsedive_url:
-            pulsedive_output = searcher.format_pulsedive_output(pulsedive_url)
-            print(pulsedive_output)
-        
-        if qianxin_links:
-            qianxin_output = searcher.format_qianxin_output(qianxin_links)
-            print(qianxin_output)
+    def resolve(apt_name):
+        name_start = time.time()
+        return searcher.search_comprehensive(apt_name), time.time() - name_start
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='apt-batch') as executor:
+        futures = {executor.submit(resolve, apt_name): apt_name for apt_name in names}
+        for future in as_completed(futures):
+            apt_name = futures[future]
+            completed += 1
+            try:
+                results, elapsed = future.result()
+            except Exception as error:
+                safe_print(f"{RED}[{completed}/{len(names)}] {apt_name}: failed ({error}){ENDC}")
+                continue
+            
+            found_sources = sum(1 for data in results[:len(SOURCE_ORDER)] if data)
+            timed_out = list(results.statuses.values()).count('timed_out')
+            busy = list(results.statuses.values()).count('busy')
+            color = GREEN if found_sources else RED
+            late = (f", {timed_out} timed out" if timed_out else "") + (f", {busy} busy" if busy else "")
+            safe_print(f"{color}[{completed}/{len(names)}] {apt_name}: {found_sources}/{len(searcher.sources)} sources{late}, {count_resources(results)} resources ({elapsed:.1f}s){ENDC}")
+    
+    searcher.scheduler.save(force=True)
+    total_time = time.time() - start_time
+    names_per_minute = len(names) / total_time * 60 if total_time > 0 else 0
+    print(f"\n{YELLOW}Processed {len(names)} names in {total_time:.1f}s ({names_per_minute:.1f} names/minute){ENDC}")
+
+def run_batch_export(searcher, names, workers, output_format):
+    def resolve(apt_name):
+        return build_result_document(apt_name, searcher.search_comprehensive(apt_name, save_files=False), searcher.sources)
+    
+    documents = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='apt-batch') as executor:
+        futures = {executor.submit(resolve, apt_name): apt_name for apt_name in names}
+        for future in as_completed(futures):
+            try:
+                document = future.result()
+            except Exception as error:
+                searcher.record_error(error)
+                document = {'schema_version': RESULT_SCHEMA_VERSION, 'query': futures[future], 'error': str(error)}
+            
+            if output_format == 'ndjson':
+                print(dump_json(document), flush=True)
+            else:
+                documents.append(document)
+    
+    searcher.scheduler.save(force=True)
+    if output_format == 'json':
+        order = {apt_name: position for position, apt_name in enumerate(names)}
+        documents.sort(key=lambda document: order[document['query']])
+        print(dump_json(documents, indent=2))
+
+def report_trace(searcher, args):
+    if not searcher.tracer:
+        return
+    
+    output = sys.stdout if args.format == 'text' else sys.stderr
+    if args.timings:
+        print(searcher.tracer.format_summary(), file=output)
+    if args.trace:
+        searcher.tracer.write_json(args.trace)
+        print(f"\n{GREEN}Trace written to {args.trace}{ENDC}", file=output)
+
+class ResultCache:
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def lookup(self, key):
+        entry = self.entries.get(key)
+        if entry and time.time() - entry[0] < self.ttl:
+            self.entries.move_to_end(key)
+            return entry[1]
+        return None
+
+    def get_or_compute(self, key, compute, cacheable=None):
+        with self.lock:
+            value = self.lookup(key)
+            if value is not None:
+                return value, True
+            event = self.pending.get(key)
+            leader = event is None
+            if leader:
+                event = self.pending[key] = threading.Event()
+        
+        if not leader:
+            event.wait()
+            with self.lock:
+                value = self.lookup(key)
+            if value is not None:
+                return value, True
+            return compute(), False
         
-        if malpedia_data:
-            malpedia_output = searcher.format_malpedia_output(malpedia_data)
-            print(malpedia_output)
+        try:
+            value = compute()
+            if self.ttl > 0 and (cacheable is None or cacheable(value)):
+                with self.lock:
+                    self.entries[key] = (time.time(), value)
+                    self.entries.move_to_end(key)
+                    while len(self.entries) > self.max_entries:
+                        self.entries.popitem(last=False)
+            return value, False
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+            event.set()
+
+    def __len__(self):
+        return len(self.entries)
+
+class SearchRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'APTSearchEngine/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == '/health':
+            self.send_json(200, self.server.health())
+        elif url.path == '/search':
+            params = urllib.parse.parse_qs(url.query)
+            self.handle_search(params.get('q', [''])[0], params.get('deadline', [None])[0])
+        elif url.path.startswith('/mitre/'):
+            self.handle_mitre_group(url.path[len('/mitre/'):])
+        else:
+            self.send_json(404, {'error': f"unknown endpoint '{url.path}'"})
+
+    def do_POST(self):
+        if urllib.parse.urlsplit(self.path).path != '/search':
+            self.send_json(404, {'error': f"unknown endpoint '{self.path}'"})
+            return
         
-        if aptnotes_matches:
-            aptnotes_output = searcher.format_aptnotes_output(aptnotes_matches)
-            print(aptnotes_output)
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self.send_json(400, {'error': 'request body must be a JSON object'})
+            return
+        if not isinstance(body, dict):
+            body = {}
+        self.handle_search(body.get('query', ''), body.get('deadline'))
+
+    def handle_search(self, apt_name, deadline=None):
+        apt_name = str(apt_name).strip()
+        if not apt_name:
+            self.send_json(400, {'error': "missing APT name; use /search?q=NAME or POST {\"query\": NAME}"})
+            return
+        
+        if deadline is not None:
+            try:
+                deadline = float(deadline)
+            except (TypeError, ValueError):
+                deadline = 0
+            if deadline <= 0:
+                self.send_json(400, {'error': 'deadline must be a positive number of seconds'})
+                return
+        
+        start = time.perf_counter()
+        try:
+            document, cached = self.server.search(apt_name, deadline)
+        except Exception as error:
+            self.server.searcher.record_error(error)
+            self.send_json(500, {'error': str(error)})
+            return
+        self.send_json(200, document, {'X-Cache': 'HIT' if cached else 'MISS', 'X-Response-Time-Ms': f"{(time.perf_counter() - start) * 1000:.1f}"})
+
+    def handle_mitre_group(self, group_id):
+        try:
+            group = self.server.searcher.get_mitre_group(urllib.parse.unquote(group_id))
+        except Exception as error:
+            self.server.searcher.record_error(error)
+            self.send_json(500, {'error': str(error)})
+            return
+        
+        if group:
+            self.send_json(200, group)
+        else:
+            self.send_json(404, {'error': f"unknown MITRE group '{group_id}'"})
+
+    def send_json(self, status, document, headers=None):
+        body = dump_json(document).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            safe_print(f"{BEBEBLUE}{self.address_string()} - {format % args}{ENDC}")
+
+class SearchServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, searcher, result_ttl=300, verbose=True):
+        super().__init__(address, SearchRequestHandler)
+        self.searcher = searcher
+        self.result_cache = ResultCache(result_ttl)
+        self.verbose = verbose
+        self.started_at = time.time()
+
+    def search(self, apt_name, deadline=None):
+        def compute():
+            return build_result_document(apt_name, self.searcher.search_comprehensive(apt_name, save_files=False, deadline=deadline), self.searcher.sources)
+        return self.result_cache.get_or_compute(apt_name.lower(), compute, lambda document: document['complete'])
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'uptime': round(time.time() - self.started_at, 1),
+            'cached_results': len(self.result_cache),
+            'indexes': self.searcher.shared_keys()
+        }
+
+def run_server(searcher, host, port, result_ttl, verbose=True):
+    print(f"{CYAN}Warming indexes and caches...{ENDC}")
+    start_time = time.time()
+    searcher.warm_up()
+    print(f"{GREEN}Ready in {time.time() - start_time:.1f}s{ENDC}")
+    
+    server = SearchServer((host, port), searcher, result_ttl, verbose)
+    print(f"{GREEN}Serving APT search API on http://{host}:{server.server_port} (GET /search?q=NAME, POST /search, GET /mitre/GROUP_ID, GET /health){ENDC}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{YELLOW}Shutting down API server{ENDC}")
+    finally:
+        server.server_close()
+        searcher.scheduler.save(force=True)
+
+def search_and_print(searcher, apt_name):
+    results = searcher.search_comprehensive(apt_name)
+    etda_data, mitre_data, google_cloud_data, netenrich_links, socradar_articles, pulsedive_url, qianxin_links, malpedia_data, aptnotes_matches, saved_files = results
+    
+    found = etda_data or mitre_data or google_cloud_data or netenrich_links or socradar_articles or pulsedive_url or qianxin_links or malpedia_data or aptnotes_matches
+    unanswered = [source for source, status in results.statuses.items() if status in INCOMPLETE_STATUSES or status == 'error']
+    
+    if found or unanswered:
+        if found:
+            print(f"\n{VIOLET}{BOLD}SEARCH RESULTS{ENDC}\n")
+            
+            for source, data in zip(SOURCE_ORDER, results):
+                if data:
+                    print(searcher.format_source_output(source, data, saved_files))
         
         print(f"\n{VIOLET}{BOLD}{'='*110}{ENDC}")
         print(f"{VIOLET}{BOLD}COMPREHENSIVE SEARCH SUMMARY{ENDC}")
         print(f"{VIOLET}{BOLD}{'='*110}{ENDC}")
-        print(f"ETDA Database: {GREEN + 'Found' + ENDC if etda_data else RED + 'Not found' + ENDC}")
-        print(f"MITRE ATT&CK: {GREEN + 'Found' + ENDC if mitre_data else RED + 'Not found' + ENDC}")
-        print(f"Google Cloud APT: {GREEN + str(len(google_cloud_data)) + ' profiles found' + ENDC if google_cloud_data else RED + 'Not available' + ENDC}")
-        print(f"NetEnrich: {GREEN + str(len(netenrich_links)) + ' resources found' + ENDC if netenrich_links else RED + 'Not available' + ENDC}")
-        print(f"SOCRadar: {GREEN + str(len(socradar_articles)) + ' articles found' + ENDC if socradar_articles else RED + 'Not available' + ENDC}")
-        print(f"Pulsedive: {GREEN + 'Found' + ENDC if pulsedive_url else RED + 'Not found' + ENDC}")
-        print(f"QiAnXin: {GREEN + 'Found' + ENDC if qianxin_links else RED + 'Not found' + ENDC}")
-        print(f"Malpedia Database: {GREEN + 'Found' + ENDC if malpedia_data else RED + 'Not found' + ENDC}")
-        print(f"APTnotes Reports: {GREEN + str(len(aptnotes_matches)) + ' reports found' + ENDC if aptnotes_matches else RED + 'Not found' + ENDC}")
-        
-        total_resources = 0
-        if etda_data:
-            total_resources += len(etda_data.get('additional_links', []))
-        if mitre_data:
-            total_resources += sum(len(group.get('techniques', [])) for group in mitre_data)
-        if google_cloud_data:
-            total_resources += len(google_cloud_data)
-        if netenrich_links:
-            total_resources += len(netenrich_links)
-        if socradar_articles:
-            total_resources += len(socradar_articles)
-        if pulsedive_url:
-            total_resources += 1
-        if qianxin_links:
-            total_resources += len(qianxin_links)
-        if malpedia_data:
-            total_resources += sum(len(item.get('resources', [])) for item in malpedia_data)
-        total_resources += len(aptnotes_matches)
+        summary_lines = {
+            'etda': f"ETDA Database: {GREEN + 'Found' + ENDC if etda_data else RED + 'Not found' + ENDC}",
+            'mitre': f"MITRE ATT&CK: {GREEN + 'Found' + ENDC if mitre_data else RED + 'Not found' + ENDC}",
+            'google_cloud': f"Google Cloud APT: {GREEN + str(len(google_cloud_data)) + ' profiles found' + ENDC if google_cloud_data else RED + 'Not available' + ENDC}",
+            'netenrich': f"NetEnrich: {GREEN + str(len(netenrich_links)) + ' resources found' + ENDC if netenrich_links else RED + 'Not available' + ENDC}",
+            'socradar': f"SOCRadar: {GREEN + str(len(socradar_articles)) + ' articles found' + ENDC if socradar_articles else RED + 'Not available' + ENDC}",
+            'pulsedive': f"Pulsedive: {GREEN + 'Found' + ENDC if pulsedive_url else RED + 'Not found' + ENDC}",
+            'qianxin': f"QiAnXin: {GREEN + 'Found' + ENDC if qianxin_links else RED + 'Not found' + ENDC}",
+            'malpedia': f"Malpedia Database: {GREEN + 'Found' + ENDC if malpedia_data else RED + 'Not found' + ENDC}",
+            'aptnotes': f"APTnotes Reports: {GREEN + str(len(aptnotes_matches)) + ' reports found' + ENDC if aptnotes_matches else RED + 'Not found' + ENDC}",
+        }
+        for source in SOURCE_ORDER:
+            status = results.statuses.get(source)
+            if status == 'skipped':
+                print(f"{SOURCE_LABELS[source]}: {YELLOW}Skipped{ENDC}")
+            elif status == 'timed_out':
+                print(f"{SOURCE_LABELS[source]}: {YELLOW}Timed out{ENDC}")
+            elif status == 'pruned':
+                print(f"{SOURCE_LABELS[source]}: {YELLOW}Skipped (unlikely to answer in time){ENDC}")
+            elif status == 'busy':
+                print(f"{SOURCE_LABELS[source]}: {YELLOW}Skipped (earlier request still running){ENDC}")
+            elif status == 'error':
+                print(f"{SOURCE_LABELS[source]}: {RED}Failed{ENDC}")
+            else:
+                print(summary_lines[source])
+        
+        total_resources = count_resources(results)
         
         print(f"{YELLOW}Total Resources Found: {total_resources}{ENDC}")
+        if not found:
+            print(f"{YELLOW}Nothing found by the sources that answered; {len(unanswered)} did not complete, so '{apt_name}' may still be known to them. Retry or raise --deadline.{ENDC}")
         
         if saved_files:
             print(f"\n{GREEN}Files Saved to Device:{ENDC}")
@@ -1422,5 +3606,236 @@ def main():
         print(f"{YELLOW}   • Numbers instead of text (e.g., 'APT1' instead of 'APT One'){ENDC}")
         print(f"{YELLOW}   • Partial names (e.g., 'Lazarus' instead of 'Lazarus Group'){ENDC}")
 
+def stream_and_print(searcher, apt_name, output_format):
+    if output_format == 'text':
+        print(f"\n{CYAN}Streaming APT Search for: {apt_name}{ENDC}")
+        print(f"{BEBEBLUE}{'='*50}{ENDC}")
+    
+    start_time = time.perf_counter()
+    results = {}
+    statuses = {}
+    saved_files = []
+    
+    for source, data in searcher.iter_sources(apt_name, statuses=statuses):
+        results[source] = data
+        elapsed = time.perf_counter() - start_time
+        
+        if output_format == 'ndjson':
+            record = {'schema_version': RESULT_SCHEMA_VERSION, 'query': apt_name, 'source': source, 'status': statuses[source], 'found': bool(data), 'elapsed_ms': round(elapsed * 1000, 1), 'data': data}
+            print(dump_json(record), flush=True)
+            continue
+        
+        if statuses[source] == 'timed_out':
+            print(f"{YELLOW}{SOURCE_LABELS[source]}: Timed out ({elapsed:.1f}s){ENDC}", flush=True)
+            continue
+        if statuses[source] == 'pruned':
+            print(f"{YELLOW}{SOURCE_LABELS[source]}: Skipped (unlikely to answer in time){ENDC}", flush=True)
+            continue
+        if statuses[source] == 'busy':
+            print(f"{YELLOW}{SOURCE_LABELS[source]}: Skipped (earlier request still running){ENDC}", flush=True)
+            continue
+        if not data:
+            print(f"{RED}{SOURCE_LABELS[source]}: Not found ({elapsed:.1f}s){ENDC}", flush=True)
+            continue
+        
+        if source == 'mitre':
+            saved_files = searcher.save_mitre_navigator_file(apt_name, data) or []
+        print(f"{GREEN}{SOURCE_LABELS[source]} ({elapsed:.1f}s){ENDC}")
+        print(searcher.format_source_output(source, data, saved_files), flush=True)
+    
+    searcher.scheduler.save()
+    if output_format == 'text':
+        found_sources = sum(1 for data in results.values() if data)
+        total_resources = count_resources(tuple(results.get(source, searcher.empty_result(source)) for source in SOURCE_ORDER) + (saved_files,))
+        print(f"\n{YELLOW}{found_sources}/{len(searcher.sources)} sources answered, {total_resources} resources in {time.perf_counter() - start_time:.1f}s{ENDC}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Advanced APT Search Engine for Comprehensive Threat Intelligence')
+    parser.add_argument('apt_name', nargs='?', help='APT group name to search (prompted for when omitted)')
+    parser.add_argument('--stream', action='store_true', help='print each source as soon as it answers instead of waiting for all of them')
+    parser.add_argument('--format', choices=['text', 'json', 'ndjson'], default='text', help='output format: formatted text, one JSON document, or one JSON record per line (per source with --stream, per name otherwise) (default: text)')
+    parser.add_argument('--batch', metavar='FILE', help="resolve every APT name in FILE (one per line, '-' for stdin) without prompting")
+    parser.add_argument('--serve', action='store_true', help='run a local HTTP/JSON API server instead of prompting')
+    parser.add_argument('--host', default='127.0.0.1', help='address the API server listens on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='port the API server listens on (default: 8080)')
+    parser.add_argument('--result-ttl', type=int, default=300, metavar='SECONDS', help='seconds the API server caches each search result (default: 300)')
+    parser.add_argument('--sync-etda', action='store_true', help='mirror every ETDA group card into the local store and exit')
+    parser.add_argument('--sync-malpedia', action='store_true', help='refresh the Malpedia actor listing and every stale actor record in the local catalogue and exit')
+    parser.add_argument('--malpedia-sync-limit', type=int, default=8, metavar='N', help='concurrent Malpedia detail requests during --sync-malpedia (default: 8)')
+    parser.add_argument('--navigator-layers', metavar='DIR', help='write an ATT&CK Navigator layer for every MITRE group, or for each name in --batch plus a combined watchlist layer, into DIR and exit')
+    parser.add_argument('--workers', type=int, default=4, help='number of APT names resolved concurrently in batch and server mode (default: 4)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help=f'directory for the HTTP response cache (default: {CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='disable the HTTP response cache')
+    parser.add_argument('--mitre-stix', metavar='PATH', help='build the MITRE ATT&CK index from a local enterprise-attack STIX bundle instead of downloading it')
+    parser.add_argument('--trace', metavar='FILE', help='write a JSON trace of every request, parse step and swallowed error to FILE')
+    parser.add_argument('--timings', action='store_true', help='print a per-source timing summary at the end of the run')
+    parser.add_argument('--timeout', type=float, metavar='SECONDS', help='read timeout applied to every source (default: per-source policy)')
+    parser.add_argument('--retries', type=int, metavar='N', help='retries on connection errors, 429 and 5xx responses for every source (default: per-source policy)')
+    parser.add_argument('--pool-size', type=int, metavar='N', help='keep-alive connections kept per source host (default: source workers plus probe workers)')
+    parser.add_argument('--sources', metavar='LIST', help='comma-separated sources or capabilities to query, e.g. mitre,etda or index (default: all)')
+    parser.add_argument('--source-stats', action='store_true', help='print the scheduler latency and hit-rate statistics per source and query shape, then exit')
+    parser.add_argument('--list-sources', action='store_true', help='list the available sources with their capabilities and exit')
+    parser.add_argument('--mitre-details', type=int, default=10, metavar='N', help='when scraping attack.mitre.org, fetch techniques for the N best-matching groups and list the rest without details; 0 fetches all (default: 10)')
+    parser.add_argument('--deadline', type=float, metavar='SECONDS', help='return after SECONDS with whatever sources have answered; late sources are reported as timed out')
+    parser.add_argument('--cache-ttl', action='append', default=[], metavar='SOURCE=SECONDS', help=f"override the cache TTL of one source ({', '.join(SOURCE_ORDER)}); may be repeated")
+    args = parser.parse_args()
+    
+    cache_ttls = {}
+    for item in args.cache_ttl:
+        source, _, seconds = item.partition('=')
+        if source not in SOURCE_HOSTS or not seconds.isdigit():
+            parser.error(f"invalid --cache-ttl value '{item}'")
+        cache_ttls[source] = int(seconds)
+    
+    policy_override = {}
+    if args.timeout is not None:
+        policy_override['read_timeout'] = args.timeout
+    if args.retries is not None:
+        policy_override['retries'] = max(0, args.retries)
+    if args.pool_size is not None:
+        policy_override['pool_maxsize'] = max(1, args.pool_size)
+    
+    if args.list_sources:
+        if args.format != 'text':
+            print_document([{'name': name, 'label': plugin.label, 'hosts': list(plugin.hosts), 'capabilities': list(plugin.capabilities), 'indexes': list(plugin.indexes)} for name, plugin in SOURCE_PLUGINS.items()], args.format)
+            return
+        for name, plugin in SOURCE_PLUGINS.items():
+            print(f"{GREEN}{name:<14}{ENDC}{plugin.label:<20}{CYAN}{', '.join(plugin.capabilities)}{ENDC}")
+        return
+    
+    if args.source_stats:
+        scheduler = SourceScheduler(None if args.no_cache else os.path.join(args.cache_dir, SOURCE_STATS_NAME))
+        if args.format != 'text':
+            print_document(scheduler.stats, args.format)
+            return
+        print(scheduler.format_stats() if scheduler.stats else f"{YELLOW}No source statistics recorded yet{ENDC}")
+        return
+    
+    try:
+        sources = select_sources(args.sources) if args.sources else list(SOURCE_ORDER)
+    except ValueError as error:
+        parser.error(str(error))
+    if not sources:
+        parser.error('--sources selected no sources')
+    
+    searcher_options = {
+        'sources': sources,
+        'mitre_detail_limit': max(0, args.mitre_details),
+        'deadline': args.deadline if args.deadline and args.deadline > 0 else None,
+        'cache_dir': None if args.no_cache else args.cache_dir,
+        'cache_ttls': cache_ttls,
+        'mitre_stix_path': args.mitre_stix,
+        'trace': bool(args.trace or args.timings),
+        'source_policies': {source: dict(policy_override) for source in SOURCE_ORDER + ['default']} if policy_override else None
+    }
+    
+    if args.format == 'json' and args.stream:
+        parser.error('--stream supports only --format text or ndjson')
+    if args.format == 'text':
+        display_banner()
+    
+    if args.sync_etda:
+        if not searcher_options['cache_dir']:
+            parser.error('--sync-etda cannot be combined with --no-cache')
+        searcher = APTSearcher(verbose=args.format == 'text', **searcher_options)
+        start_time = time.time()
+        try:
+            stats = searcher.sync_etda()
+        except requests.RequestException as error:
+            if args.format != 'text':
+                print_document({'mode': 'sync_etda', 'error': str(error)}, args.format)
+            else:
+                print(f"{RED}ETDA sync failed: {error}{ENDC}")
+            return
+        if args.format != 'text':
+            print_document({'mode': 'sync_etda', 'elapsed': round(time.time() - start_time, 1), **stats}, args.format)
+            report_trace(searcher, args)
+            return
+        print(f"{GREEN}ETDA mirror synced in {time.time() - start_time:.1f}s: {stats['new']} new, {stats['updated']} updated, {stats['unchanged']} unchanged, {stats['removed']} removed, {stats['failed']} failed{ENDC}")
+        if stats['removal_skipped']:
+            print(f"{YELLOW}Kept cards missing from the listing: the sync had failures or the listing looked incomplete{ENDC}")
+        report_trace(searcher, args)
+        return
+    
+    if args.sync_malpedia:
+        if not searcher_options['cache_dir']:
+            parser.error('--sync-malpedia cannot be combined with --no-cache')
+        searcher = APTSearcher(verbose=args.format == 'text', malpedia_sync_limit=max(1, args.malpedia_sync_limit), **searcher_options)
+        start_time = time.time()
+        try:
+            stats = searcher.sync_malpedia()
+        except requests.RequestException as error:
+            if args.format != 'text':
+                print_document({'mode': 'sync_malpedia', 'error': str(error)}, args.format)
+            else:
+                print(f"{RED}Malpedia sync failed: {error}{ENDC}")
+            return
+        if args.format != 'text':
+            print_document({'mode': 'sync_malpedia', 'elapsed': round(time.time() - start_time, 1), **stats}, args.format)
+            report_trace(searcher, args)
+            return
+        print(f"{GREEN}Malpedia catalogue synced in {time.time() - start_time:.1f}s: {stats['actors']} actors, {stats['updated']} updated, {stats['failed']} failed{ENDC}")
+        report_trace(searcher, args)
+        return
+    
+    if args.navigator_layers:
+        names = read_batch_names(args.batch) if args.batch else None
+        searcher = APTSearcher(verbose=args.format == 'text', **searcher_options)
+        start_time = time.time()
+        export = searcher.export_navigator_layers(args.navigator_layers, names)
+        if args.format != 'text':
+            document = {'mode': 'navigator_layers', 'output_dir': args.navigator_layers, 'elapsed': round(time.time() - start_time, 1)}
+            document.update(export or {'error': 'MITRE ATT&CK index unavailable'})
+            print_document(document, args.format)
+            report_trace(searcher, args)
+            return
+        if not export:
+            print(f"{RED}MITRE ATT&CK index unavailable; no layers written.{ENDC}")
+            return
+        print(f"{GREEN}Wrote {len(export['layers'])} Navigator layers from {export['groups']} MITRE groups to {args.navigator_layers} in {time.time() - start_time:.1f}s{ENDC}")
+        if export['missing']:
+            print(f"{YELLOW}No MITRE group matched: {', '.join(export['missing'])}{ENDC}")
+        report_trace(searcher, args)
+        return
+    
+    if args.serve:
+        workers = max(1, args.workers)
+        searcher = APTSearcher(max_workers=len(searcher_options['sources']) * workers, verbose=False, shared_ttl=DEFAULT_CACHE_TTL, serve_stale=True, **searcher_options)
+        run_server(searcher, args.host, args.port, args.result_ttl)
+        report_trace(searcher, args)
+        return
+    
+    if args.batch:
+        names = read_batch_names(args.batch)
+        if not names:
+            print(f"{RED}No APT names found in {args.batch}.{ENDC}")
+            return
+        
+        workers = max(1, args.workers)
+        searcher = APTSearcher(max_workers=len(searcher_options['sources']) * workers, verbose=False, **searcher_options)
+        run_batch(searcher, names, workers, args.format)
+        report_trace(searcher, args)
+        return
+    
+    if args.format != 'text' and not args.apt_name:
+        parser.error(f"--format {args.format} needs the APT name as an argument")
+    
+    searcher = APTSearcher(verbose=not args.stream and args.format == 'text', **searcher_options)
+    
+    apt_name = (args.apt_name or input(f"{WHITE}Enter APT group name to search: {ENDC}")).strip()
+    
+    if not apt_name:
+        print(f"{RED}Please enter a valid APT name.{ENDC}")
+        return
+    
+    if args.stream:
+        stream_and_print(searcher, apt_name, args.format)
+    elif args.format != 'text':
+        document = build_result_document(apt_name, searcher.search_comprehensive(apt_name, save_files=False), searcher.sources)
+        print_document(document, args.format)
+    else:
+        search_and_print(searcher, apt_name)
+    report_trace(searcher, args)
+
 if __name__ == "__main__":
     main()
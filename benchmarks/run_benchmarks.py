@@ -0,0 +1,215 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from urllib.parse import urlencode
+
+import requests
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCHMARK_DIR, 'fixtures')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from apt_search_engine import APTSearcher, MitreAttackIndex, APTnotesIndex, AliasGraph, NameMatcher, GREEN, RED, YELLOW, CYAN, ENDC
+
+ROUTES = [
+    (r'apt\.etda\.or\.th/cgi-bin/listgroups\.cgi', 'etda_listgroups.html'),
+    (r'apt\.etda\.or\.th/cgi-bin/showcard\.cgi', 'etda_showcard.html'),
+    (r'attack\.mitre\.org/groups/$', 'mitre_groups.html'),
+    (r'attack\.mitre\.org/groups/G\d+/$', 'mitre_group_G0007.html'),
+    (r'enterprise-attack\.json$', 'enterprise_attack.json'),
+    (r'malpedia\.caad\.fkie\.fraunhofer\.de/api/list/actors', 'malpedia_actors.json'),
+    (r'malpedia\.caad\.fkie\.fraunhofer\.de/api/get/actor/apt28$', 'malpedia_actor_apt28.json'),
+    (r'malpedia\.caad\.fkie\.fraunhofer\.de/actor/', 'malpedia_actor.html'),
+    (r'malpedia\.caad\.fkie\.fraunhofer\.de/library', 'malpedia_library.html'),
+    (r'socradar\.io/\?s=', 'socradar_search.html'),
+    (r'ti\.qianxin\.com/apt/apt$', 'qianxin_apt.html'),
+    (r'cloud\.google\.com/', 'google_cloud_apt.html'),
+    (r'know\.netenrich\.com/content/search', 'netenrich_search.html'),
+    (r'pulsedive\.com/threat/', 'pulsedive_threat.html'),
+    (r'pulsedive\.com/search', 'pulsedive_search.html'),
+    (r'APTnotes\.json$', 'aptnotes.json'),
+]
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+class FixtureSession:
+    def __init__(self, routes):
+        self.routes = [(re.compile(pattern), name) for pattern, name in routes]
+        self.bodies = {}
+        self.headers = {}
+
+    def request(self, method, url, params=None, **kwargs):
+        if params:
+            url = f"{url}?{urlencode(params)}"
+
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+        response.status_code = 404
+        response.reason = 'Not Found'
+        response._content = b''
+
+        for pattern, name in self.routes:
+            if pattern.search(url):
+                if name not in self.bodies:
+                    self.bodies[name] = load_fixture(name)
+                response.status_code = 200
+                response.reason = 'OK'
+                response._content = self.bodies[name] if method == 'GET' else b''
+                break
+
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+def offline_searcher(routes=ROUTES):
+    searcher = APTSearcher(verbose=False, cache_dir=None)
+    searcher.session = FixtureSession(routes)
+    return searcher
+
+def cold(searcher, func, *keys):
+    def run():
+        searcher.clear_shared(*keys)
+        return func()
+    return run
+
+def build_cases(apt_name):
+    searcher = offline_searcher()
+    html_searcher = offline_searcher([route for route in ROUTES if route[1] not in ('enterprise_attack.json', 'malpedia_actors.json')])
+
+    showcard_url = f"{searcher.base_url}/cgi-bin/showcard.cgi?g=APT%2028&n=1"
+    listgroups_soup = searcher.parse_html(load_fixture('etda_listgroups.html'))
+    showcard_soup = searcher.parse_html(load_fixture('etda_showcard.html'))
+    actor_soup = searcher.parse_html(load_fixture('malpedia_actor.html'))
+    library_soup = searcher.parse_html(load_fixture('malpedia_library.html'))
+    pulsedive_soup = searcher.parse_html(load_fixture('pulsedive_search.html'))
+    aptnotes_index = APTnotesIndex(json.loads(load_fixture('aptnotes.json')))
+    stix_bundle = json.loads(load_fixture('enterprise_attack.json'))
+    mitre_index = MitreAttackIndex.from_bundle(stix_bundle, searcher.mitre_base)
+    malpedia_catalogue = searcher.load_malpedia_catalogue()
+    name_matcher = NameMatcher((group_id, [group['name']] + group['associated_groups'].split(', ')) for group_id, group in mitre_index.groups.items())
+
+    return [
+        ('search_apt_etda', lambda: searcher.search_apt_etda(apt_name)),
+        ('extract_apt_info_etda', lambda: searcher.extract_apt_info_etda(showcard_url)),
+        ('search_mitre_attack[index]', cold(searcher, lambda: searcher.search_mitre_attack(apt_name), 'mitre_index')),
+        ('search_mitre_attack[html]', cold(html_searcher, lambda: html_searcher.search_mitre_attack(apt_name), 'mitre_index', 'mitre_groups')),
+        ('get_mitre_group_details[html]', lambda: html_searcher.get_mitre_group_details('G0007')),
+        ('search_google_cloud_apt', cold(searcher, lambda: searcher.search_google_cloud_apt(apt_name), 'google_cloud_index')),
+        ('search_google_cloud_apt[index]', lambda: searcher.search_google_cloud_apt(apt_name)),
+        ('search_netenrich', lambda: searcher.search_netenrich(apt_name)),
+        ('search_socradar', lambda: searcher.search_socradar(apt_name)),
+        ('search_pulsedive', lambda: searcher.search_pulsedive(apt_name)),
+        ('search_qianxin', cold(searcher, lambda: searcher.search_qianxin(apt_name), 'qianxin_page')),
+        ('collect_mitre[alias]', lambda: searcher.collect_mitre(apt_name)),
+        ('search_malpedia[catalogue]', lambda: searcher.search_malpedia(apt_name)),
+        ('search_malpedia[guess]', lambda: html_searcher.search_malpedia(apt_name)),
+        ('collect_aptnotes', cold(searcher, lambda: searcher.collect_aptnotes(apt_name), 'aptnotes_index')),
+        ('APTnotesIndex.search', lambda: aptnotes_index.search(apt_name)),
+        ('NameMatcher.top', lambda: name_matcher.top(apt_name)),
+        ('extract_apt_groups_from_list', lambda: searcher.extract_apt_groups_from_list(listgroups_soup, apt_name)),
+        ('extract_etda_operations', lambda: searcher.extract_etda_operations(showcard_soup)),
+        ('extract_etda_links', lambda: searcher.extract_etda_links(showcard_soup)),
+        ('extract_malpedia_actor_info', lambda: searcher.extract_malpedia_actor_info(actor_soup, f"{searcher.malpedia_base}/actor/apt28")),
+        ('extract_malpedia_library_info', lambda: searcher.extract_malpedia_library_info(library_soup, apt_name)),
+        ('extract_pulsedive_search_results', lambda: searcher.extract_pulsedive_search_results(pulsedive_soup, apt_name)),
+        ('MitreAttackIndex.from_bundle', lambda: MitreAttackIndex.from_bundle(stix_bundle, searcher.mitre_base)),
+        ('AliasGraph.build', lambda: AliasGraph.build(mitre_index, [], malpedia_catalogue)),
+    ]
+
+def measure(func, min_time, min_runs):
+    func()
+
+    runs = 0
+    start = time.perf_counter()
+    while runs < min_runs or time.perf_counter() - start < min_time:
+        func()
+        runs += 1
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'ops_per_sec': runs / elapsed,
+        'mean_ms': elapsed / runs * 1000,
+        'peak_kib': peak / 1024
+    }
+
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('results', {})
+    except (OSError, ValueError):
+        return {}
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmarks for the APT Search Engine parsing and matching paths')
+    parser.add_argument('--query', default='APT28', help='APT name used by every benchmark (default: APT28)')
+    parser.add_argument('--only', metavar='REGEX', help='run only benchmarks whose name matches REGEX')
+    parser.add_argument('--min-time', type=float, default=0.5, help='minimum seconds spent timing each benchmark (default: 0.5)')
+    parser.add_argument('--min-runs', type=int, default=5, help='minimum iterations per benchmark (default: 5)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline file to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='relative ops/sec drop reported as a regression (default: 0.2)')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON to PATH')
+    args = parser.parse_args()
+
+    baseline = {} if args.save_baseline else load_baseline(args.baseline)
+    results = {}
+    regressions = []
+
+    print(f"{CYAN}{'Benchmark':<36} {'ops/sec':>12} {'mean ms':>10} {'peak KiB':>10} {'vs baseline':>12}{ENDC}")
+    for name, func in build_cases(args.query):
+        if args.only and not re.search(args.only, name):
+            continue
+
+        result = measure(func, args.min_time, args.min_runs)
+        results[name] = result
+
+        change = ''
+        color = ENDC
+        if name in baseline:
+            ratio = result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1
+            change = f"{ratio:+.1%}"
+            if ratio < -args.threshold:
+                regressions.append(name)
+                color = RED
+            elif ratio > args.threshold:
+                color = GREEN
+
+        print(f"{color}{name:<36} {result['ops_per_sec']:>12.1f} {result['mean_ms']:>10.3f} {result['peak_kib']:>10.1f} {change:>12}{ENDC}")
+
+    document = {'query': args.query, 'python': sys.version.split()[0], 'results': results}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"\n{GREEN}Saved baseline to {args.baseline}{ENDC}")
+
+    if regressions:
+        print(f"\n{RED}Regressions beyond {args.threshold:.0%}: {', '.join(regressions)}{ENDC}")
+        sys.exit(1)
+    elif baseline:
+        print(f"\n{GREEN}No regressions beyond {args.threshold:.0%}{ENDC}")
+    else:
+        print(f"\n{YELLOW}No baseline found; run with --save-baseline to record one{ENDC}")
+
+if __name__ == "__main__":
+    main()